@@ -3,10 +3,12 @@
 This module provides a Server class to
 paginate a database of popular baby names.
 """
-import csv
-from typing import List
+import threading
+from typing import List, Optional, Tuple
 from math import ceil
 
+from storage import DatasetLoader, slice_ranges
+
 
 def index_range(page: int, page_size: int) -> tuple:
     """
@@ -31,19 +33,59 @@ class Server:
     """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
-        self.__dataset = None
+    def __init__(self, backend: str = "list", preload: bool = False,
+                 snapshot: Optional[str] = None, workers: int = 1,
+                 auto_refresh: bool = False):
+        """
+        Args:
+            backend (str): "list" parses the whole CSV into memory,
+                "index" only keeps a row-offset table and reads pages
+                from a memory-mapped file, "columnar" keeps every column
+                as a dictionary-encoded typed array.
+            preload (bool): Load the dataset in a background thread
+                right away instead of on first use.
+            snapshot (str): Optional path of a binary snapshot of the
+                parsed dataset, reused while DATA_FILE is unchanged.
+            workers (int): Processes used to parse the CSV in parallel
+                byte ranges; 1 parses it sequentially.
+            auto_refresh (bool): Check DATA_FILE for appended rows
+                whenever the dataset is accessed. Always on with the
+                "index" backend, which reads rows from the file itself.
+        """
+        self.backend = backend
+        self.auto_refresh = auto_refresh
+        self.__loader = DatasetLoader(self.DATA_FILE, backend, snapshot,
+                                      workers)
+        if preload:
+            threading.Thread(target=self.dataset, daemon=True).start()
+
+    @property
+    def load_duration(self) -> Optional[float]:
+        """Seconds spent loading the dataset, None until it is loaded
+        """
+        return self.__loader.load_duration
 
     def dataset(self) -> List[List]:
         """Cached dataset
         """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Skip the header
+        if self.auto_refresh or self.backend == "index":
+            self.refresh()
+        return self.__loader.dataset()
+
+    def refresh(self) -> int:
+        """
+        Pick up changes made to DATA_FILE since it was loaded.
 
-        return self.__dataset
+        Rows appended to the file are parsed and added in place; a
+        truncated or rewritten file is reloaded from scratch.
+
+        Returns:
+            int: The number of rows added, or reloaded after a rewrite.
+        """
+        change, _, rows = self.__loader.refresh()
+        if change == "rewritten":
+            return len(self.__loader.dataset())
+        return len(rows)
 
     def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
         """
@@ -68,3 +110,28 @@ class Server:
             return []
 
         return data[start_index:end_index]
+
+    def get_pages(self, requests: List[Tuple[int, int]]) -> List[List[List]]:
+        """
+        Returns several pages of the dataset at once.
+
+        Args:
+            requests (List[Tuple[int, int]]): (page, page_size) pairs.
+
+        Returns:
+            List[List[List]]: The rows of each page, in request order.
+        """
+        for page, page_size in requests:
+            assert isinstance(
+                page, int) and page > 0, "Page must be a positive integer."
+            assert (isinstance(page_size, int) and
+                    page_size > 0), "Page size must be a positive integer."
+
+        data = self.dataset()
+        total_items = len(data)
+        ranges = []
+        for page, page_size in requests:
+            start_index, end_index = index_range(page, page_size)
+            ranges.append((min(start_index, total_items),
+                           min(end_index, total_items)))
+        return slice_ranges(data, ranges)
@@ -6,10 +6,15 @@ and includes methods to return paginated data
 with additional hypermedia information.
 """
 
-import csv
-from typing import List, Dict, Optional
+import threading
+from typing import IO, Iterator, List, Dict, Optional, Tuple
+from itertools import islice
 from math import ceil
 
+from export import WRITERS
+from secondary_index import SecondaryIndex
+from storage import DatasetLoader, iter_rows, slice_ranges
+
 
 def index_range(page: int, page_size: int) -> tuple:
     """
@@ -33,28 +38,97 @@ class Server:
     """Server class to paginate a database of popular baby names.
     """
     DATA_FILE = "Popular_Baby_Names.csv"
+    INDEX_COLUMNS = {"year": 0, "gender": 1, "ethnicity": 2, "name": 3}
 
-    def __init__(self):
-        self.__dataset = None
+    def __init__(self, backend: str = "list", indexes: Tuple[str, ...] = (),
+                 preload: bool = False, snapshot: Optional[str] = None,
+                 workers: int = 1, auto_refresh: bool = False):
+        """
+        Args:
+            backend (str): "list" parses the whole CSV into memory,
+                "index" only keeps a row-offset table and reads pages
+                from a memory-mapped file, "columnar" keeps every column
+                as a dictionary-encoded typed array.
+            indexes (Tuple[str, ...]): Columns of INDEX_COLUMNS to build
+                secondary indexes on, enabling filtered pages.
+            preload (bool): Load the dataset in a background thread
+                right away instead of on first use.
+            snapshot (str): Optional path of a binary snapshot of the
+                parsed dataset, reused while DATA_FILE is unchanged.
+            workers (int): Processes used to parse the CSV in parallel
+                byte ranges; 1 parses it sequentially.
+            auto_refresh (bool): Check DATA_FILE for appended rows
+                whenever the dataset is accessed. Always on with the
+                "index" backend, which reads rows from the file itself.
+        """
+        assert all(name in self.INDEX_COLUMNS
+                   for name in indexes), "Unknown index column."
+        self.backend = backend
+        self.auto_refresh = auto_refresh
+        self.indexes = tuple(indexes)
+        self.__loader = DatasetLoader(self.DATA_FILE, backend, snapshot,
+                                      workers)
+        self.__secondary_index = None
+        self.__lock = self.__loader.lock
+        if preload:
+            threading.Thread(target=self.dataset, daemon=True).start()
+
+    @property
+    def load_duration(self) -> Optional[float]:
+        """Seconds spent loading the dataset, None until it is loaded
+        """
+        return self.__loader.load_duration
 
     def dataset(self) -> List[List]:
         """Cached dataset
         """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Skip the header
+        if self.auto_refresh or self.backend == "index":
+            self.refresh()
+        return self.__loader.dataset()
+
+    def refresh(self) -> int:
+        """
+        Pick up changes made to DATA_FILE since it was loaded.
+
+        Rows appended to the file are parsed and added in place; a
+        truncated or rewritten file is reloaded from scratch.
 
-        return self.__dataset
+        Returns:
+            int: The number of rows added, or reloaded after a rewrite.
+        """
+        with self.__lock:
+            change, start, rows = self.__loader.refresh()
+            if change == "rewritten":
+                self.__secondary_index = None
+                return len(self.__loader.dataset())
+            if rows and self.__secondary_index is not None:
+                self.__secondary_index.extend(start, rows)
+            return len(rows)
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+    def secondary_index(self) -> SecondaryIndex:
+        """Cached posting lists over the columns chosen at construction
+        """
+        # Read once: refresh() may reset it meanwhile
+        secondary_index = self.__secondary_index
+        if secondary_index is None:
+            with self.__lock:
+                if self.__secondary_index is None:
+                    self.__secondary_index = SecondaryIndex(self.dataset(), {
+                        name: self.INDEX_COLUMNS[name]
+                        for name in self.indexes})
+                secondary_index = self.__secondary_index
+        return secondary_index
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 **filters) -> List[List]:
         """
         Returns a page of the dataset.
 
         Args:
             page (int): The page number (1-indexed).
             page_size (int): The number of items per page.
+            **filters: Optional year, gender, ethnicity and name_prefix
+                values; only matching rows are paginated.
 
         Returns:
             List[List]: The list of rows for the specified page.
@@ -67,6 +141,10 @@ class Server:
         start_index, end_index = index_range(page, page_size)
         data = self.dataset()
 
+        if filters:
+            positions = self.secondary_index().lookup(**filters)
+            return [data[i] for i in positions[start_index:end_index]]
+
         if start_index >= len(data):
             return []
 
@@ -74,20 +152,26 @@ class Server:
 
     def get_hyper(self,
                   page: int = 1,
-                  page_size: int = 10) -> Dict[str,
-                                               Optional[int]]:
+                  page_size: int = 10,
+                  **filters) -> Dict[str,
+                                     Optional[int]]:
         """
         Returns a dictionary containing pagination information.
 
         Args:
             page (int): The page number (1-indexed).
             page_size (int): The number of items per page.
+            **filters: Optional year, gender, ethnicity and name_prefix
+                values; only matching rows are paginated.
 
         Returns:
             Dict: A dictionary containing the pagination information.
         """
-        data = self.get_page(page, page_size)
-        total_items = len(self.dataset())
+        data = self.get_page(page, page_size, **filters)
+        if filters:
+            total_items = len(self.secondary_index().lookup(**filters))
+        else:
+            total_items = len(self.dataset())
         total_pages = ceil(total_items / page_size)
 
         return {
@@ -98,3 +182,121 @@ class Server:
             'prev_page': page - 1 if page > 1 else None,
             'total_pages': total_pages,
         }
+
+    def get_pages(self, requests: List[Tuple[int, int]],
+                  **filters) -> List[List[List]]:
+        """
+        Returns several pages of the dataset at once.
+
+        Args:
+            requests (List[Tuple[int, int]]): (page, page_size) pairs.
+            **filters: Optional year, gender, ethnicity and name_prefix
+                values; only matching rows are paginated.
+
+        Returns:
+            List[List[List]]: The rows of each page, in request order.
+        """
+        for page, page_size in requests:
+            assert isinstance(
+                page, int) and page > 0, "Page must be a positive integer."
+            assert (isinstance(page_size, int) and
+                    page_size > 0), "Page size must be a positive integer."
+
+        data = self.dataset()
+        positions = None
+        if filters:
+            positions = self.secondary_index().lookup(**filters)
+        total_items = len(data if positions is None else positions)
+        ranges = []
+        for page, page_size in requests:
+            start_index, end_index = index_range(page, page_size)
+            ranges.append((min(start_index, total_items),
+                           min(end_index, total_items)))
+        if positions is None:
+            return slice_ranges(data, ranges)
+        return [[data[i] for i in page_positions]
+                for page_positions in slice_ranges(positions, ranges)]
+
+    def get_hyper_many(self, requests: List[Tuple[int, int]],
+                       **filters) -> List[Dict]:
+        """
+        Returns the pagination information of several pages at once.
+
+        Args:
+            requests (List[Tuple[int, int]]): (page, page_size) pairs.
+            **filters: Optional year, gender, ethnicity and name_prefix
+                values; only matching rows are paginated.
+
+        Returns:
+            List[Dict]: One get_hyper dictionary per request, in order.
+        """
+        pages = self.get_pages(requests, **filters)
+        if filters:
+            total_items = len(self.secondary_index().lookup(**filters))
+        else:
+            total_items = len(self.dataset())
+
+        hypers = []
+        for (page, page_size), data in zip(requests, pages):
+            total_pages = ceil(total_items / page_size)
+            hypers.append({
+                'page_size': len(data),
+                'page': page,
+                'data': data,
+                'next_page': page + 1 if page < total_pages else None,
+                'prev_page': page - 1 if page > 1 else None,
+                'total_pages': total_pages,
+            })
+        return hypers
+
+    def iter_rows(self, **filters) -> Iterator[List]:
+        """
+        Yields every row of the dataset lazily, straight from storage.
+
+        Args:
+            **filters: Optional year, gender, ethnicity and name_prefix
+                values; only matching rows are yielded.
+        """
+        data = self.dataset()
+        if filters:
+            positions = self.secondary_index().lookup(**filters)
+            return (data[i] for i in positions)
+        return iter_rows(data)
+
+    def iter_pages(self, page_size: int = 10,
+                   **filters) -> Iterator[List[List]]:
+        """
+        Yields the pages of the dataset one at a time, in order.
+
+        Args:
+            page_size (int): The number of items per page.
+            **filters: Optional year, gender, ethnicity and name_prefix
+                values; only matching rows are paginated.
+        """
+        assert (isinstance(page_size, int) and
+                page_size > 0), "Page size must be a positive integer."
+
+        rows = self.iter_rows(**filters)
+        page = list(islice(rows, page_size))
+        while page:
+            yield page
+            page = list(islice(rows, page_size))
+
+    def export(self, sink: IO, fmt: str = "csv",
+               header: Optional[List[str]] = None, **filters) -> int:
+        """
+        Streams the whole dataset to a sink with bounded memory.
+
+        Args:
+            sink (IO): A text file; open it with newline="" for CSV.
+            fmt (str): "csv" or "ndjson".
+            header (List[str]): Optional column names to write first
+                (CSV) or to key every record by (NDJSON).
+            **filters: Optional year, gender, ethnicity and name_prefix
+                values; only matching rows are exported.
+
+        Returns:
+            int: The number of rows written.
+        """
+        assert fmt in WRITERS, "Unknown export format."
+        return WRITERS[fmt](self.iter_rows(**filters), sink, header)
@@ -3,40 +3,279 @@
 Deletion-resilient hypermedia pagination
 """
 
-import csv
-from typing import List, Dict
+import os
+import secrets
+import threading
+import warnings
+import weakref
+from math import ceil
+from typing import IO, Iterator, List, Dict, Optional, Tuple
+
+from cursor import SortedIndex, decode_cursor, encode_cursor
+from export import WRITERS
+from live_index import LiveIndex
+from read_ahead import ReadAheadBuffer
+from shared import RowMap
+from storage import DatasetLoader
 
 
 class Server:
     """Server class to paginate a database of popular baby names.
     """
     DATA_FILE = "Popular_Baby_Names.csv"
+    # Key signing cursors; a random one is drawn on first use if unset
+    CURSOR_SECRET = os.environ.get("PAGINATION_CURSOR_SECRET", "").encode()
+    __secret_lock = threading.Lock()
 
-    def __init__(self):
-        self.__dataset = None
+    def __init__(self, preload: bool = False,
+                 snapshot: Optional[str] = None, workers: int = 1,
+                 auto_refresh: bool = False, backend: str = "list",
+                 read_ahead: int = 0):
+        """
+        Args:
+            preload (bool): Load and index the dataset in a background
+                thread right away instead of on first use.
+            snapshot (str): Optional path of a binary snapshot of the
+                parsed dataset, reused while DATA_FILE is unchanged.
+            workers (int): Processes used to parse the CSV in parallel
+                byte ranges; 1 parses it sequentially.
+            auto_refresh (bool): Check DATA_FILE for appended rows
+                whenever the dataset is accessed. Always on with the
+                "index" backend, which reads rows from the file itself.
+            backend (str): "list" keeps rows as Python lists indexed by
+                a dict. "index" and "columnar" keep them in mmap-backed
+                or typed-array storage and indexed_dataset() becomes a
+                RowMap view over it, so a dataset preloaded before a fork
+                stays shared copy-on-write between worker processes.
+            read_ahead (int): Pages to prefetch in a background thread
+                after every get_hyper_index call, for clients following
+                next_index; 0 disables read-ahead.
+        """
+        assert (isinstance(read_ahead, int) and
+                read_ahead >= 0), "Read-ahead must be a natural number."
+        self.backend = backend
+        self.auto_refresh = auto_refresh
+        self.__loader = DatasetLoader(self.DATA_FILE, backend, snapshot,
+                                      workers)
         self.__indexed_dataset = None
+        self.__live_index = None
+        self.__sorted_indexes = {}
+        self.__lock = self.__loader.lock
+        self.__read_ahead = None
+        if read_ahead:
+            self.__read_ahead = ReadAheadBuffer(self.__read_page, read_ahead)
+            # Stops the thread when the server is collected without close()
+            weakref.finalize(self, self.__read_ahead.close)
+        if preload:
+            threading.Thread(target=self.indexed_dataset, daemon=True).start()
+
+    @property
+    def load_duration(self) -> Optional[float]:
+        """Seconds spent loading the dataset, None until it is loaded
+        """
+        return self.__loader.load_duration
 
     def dataset(self) -> List[List]:
         """Cached dataset
         """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+        if self.auto_refresh or self.backend == "index":
+            self.refresh()
+        return self.__loader.dataset()
+
+    def refresh(self) -> int:
+        """
+        Pick up changes made to DATA_FILE since it was loaded.
+
+        Rows appended to the file are parsed and added in place, along
+        with the indexes built so far; a truncated or rewritten file is
+        reloaded from scratch, which also forgets deletions.
+
+        Returns:
+            int: The number of rows added, or reloaded after a rewrite.
+        """
+        with self.__lock:
+            change, start, rows = self.__loader.refresh()
+            if change == "unchanged":
+                return 0
+            if self.__read_ahead is not None:
+                self.__read_ahead.invalidate()
+            if change == "rewritten":
+                self.__indexed_dataset = None
+                self.__live_index = None
+                self.__sorted_indexes = {}
+                return len(self.__loader.dataset())
+            if self.__indexed_dataset is not None:
+                if self.backend == "list":
+                    for position, row in enumerate(rows, start):
+                        self.__indexed_dataset[position] = row
+                for sorted_index in self.__sorted_indexes.values():
+                    sorted_index.extend(enumerate(rows, start))
+            if self.__live_index is not None:
+                self.__live_index.extend(len(rows))
+            return len(rows)
+
+    def close(self):
+        """Stop the read-ahead thread; pages are then read on demand
+        """
+        if self.__read_ahead is not None:
+            self.__read_ahead.close()
+
+    def __enter__(self):
+        """Return the server, to use in a with statement
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the server
+        """
+        self.close()
+
+    def __poll(self):
+        """Pick up changes to DATA_FILE when the server follows it
+        """
+        if self.auto_refresh or self.backend == "index":
+            self.refresh()
 
-        return self.__dataset
+    def __view(self) -> Tuple[Dict[int, List], LiveIndex]:
+        """Return the indexed dataset and the live index, checking
+        DATA_FILE once for both; the caller holds the lock
+        """
+        self.__poll()
+        return self.__indexed(), self.__live()
 
     def indexed_dataset(self) -> Dict[int, List]:
         """Dataset indexed by sorting position, starting at 0
         """
-        if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            truncated_dataset = dataset[:1000]
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
-        return self.__indexed_dataset
+        self.__poll()
+        return self.__indexed()
+
+    def __indexed(self) -> Dict[int, List]:
+        """Build the indexed dataset on first use
+        """
+        # Read once: refresh() may reset it meanwhile
+        indexed_dataset = self.__indexed_dataset
+        if indexed_dataset is None:
+            with self.__lock:
+                if self.__indexed_dataset is None:
+                    dataset = self.dataset()
+                    if self.backend != "list":
+                        self.__indexed_dataset = RowMap(dataset,
+                                                        self.__live())
+                    else:
+                        self.__indexed_dataset = {
+                            i: dataset[i] for i in range(len(dataset))
+                        }
+                indexed_dataset = self.__indexed_dataset
+        return indexed_dataset
+
+    def live_index(self) -> LiveIndex:
+        """Rank/select index over the positions that were not deleted
+        """
+        self.__poll()
+        return self.__live()
+
+    def __live(self) -> LiveIndex:
+        """Build the live index on first use
+        """
+        live_index = self.__live_index
+        if live_index is None:
+            with self.__lock:
+                if self.__live_index is None:
+                    self.__live_index = LiveIndex(len(self.dataset()))
+                live_index = self.__live_index
+        return live_index
+
+    def delete(self, index: int) -> bool:
+        """
+        Delete the row at a dataset position.
+
+        Args:
+            index (int): The position of the row to delete.
+
+        Returns:
+            bool: True if a row was deleted, False if it already was.
+        """
+        assert isinstance(index, int), "Index must be an integer."
+        with self.__lock:
+            indexed_dataset, live = self.__view()
+            row = indexed_dataset.pop(index, None)
+            if self.__read_ahead is not None:
+                self.__read_ahead.discard(index)
+            if row is not None:
+                for sorted_index in self.__sorted_indexes.values():
+                    sorted_index.remove(row, index)
+            # Popping from a RowMap already marked the position deleted
+            return live.delete(index) or row is not None
+
+    def live_count(self) -> int:
+        """Number of rows that were not deleted
+        """
+        return len(self.live_index())
+
+    def row_at(self, rank: int) -> List:
+        """
+        Return the row at a live rank, skipping deleted positions.
+
+        Args:
+            rank (int): The 0-based rank among the remaining rows.
+
+        Returns:
+            List: The row.
+
+        Raises:
+            IndexError: If there are not more than rank remaining rows.
+        """
+        rows, _ = self.__rows_at(rank, 1)
+        if not rows:
+            raise IndexError("live rank out of range")
+        return rows[0]
+
+    def __rows_at(self, rank: int, count: int) -> Tuple[List[List], int]:
+        """Return up to count rows from a live rank on, and the number of
+        remaining rows once the deleted ones met on the way are skipped
+        """
+        rows = []
+        with self.__lock:
+            indexed_dataset, live = self.__view()
+            while len(rows) < count and rank < len(live):
+                position = live.select(rank)
+                if position in indexed_dataset:
+                    rows.append(indexed_dataset[position])
+                    rank += 1
+                else:
+                    # Deleted straight from the dict: record it in the index
+                    live.delete(position)
+            return rows, len(live)
+
+    def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict:
+        """
+        Return a page of the remaining rows, numbered as if deleted rows
+        had never existed.
+
+        Args:
+            page (int): The page number (1-indexed).
+            page_size (int): The number of items per page.
+
+        Returns:
+            Dict: A dictionary containing the pagination information.
+        """
+        assert isinstance(
+            page, int) and page > 0, "Page must be a positive integer."
+        assert (isinstance(page_size, int) and
+                page_size > 0), "Page size must be a positive integer."
+
+        start = (page - 1) * page_size
+        data, total_items = self.__rows_at(start, page_size)
+        total_pages = ceil(total_items / page_size)
+
+        return {
+            'page_size': len(data),
+            'page': page,
+            'data': data,
+            'next_page': page + 1 if page < total_pages else None,
+            'prev_page': page - 1 if page > 1 else None,
+            'total_pages': total_pages,
+        }
 
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
         """
@@ -49,22 +288,280 @@ class Server:
         Returns:
             Dict: A dictionary containing pagination information.
         """
-        assert isinstance(index, int) and 0 <= index < len(
-            self.indexed_dataset()), "Index out of range"
+        assert isinstance(index, int), "Index out of range"
+        with self.__lock:
+            view = self.__view()
+            # Indexes are dataset positions, deleted ones included
+            assert 0 <= index < view[1].size, "Index out of range"
+            page = None
+            if self.__read_ahead is not None:
+                page = self.__read_ahead.pop(index, page_size)
+            # A prefetched page is stale once one of its rows was deleted
+            if page is None or not all(position in view[0]
+                                       for position in page[0]):
+                page = self.__read_page(index, page_size, view)
+        positions, result = page
+        if self.__read_ahead is not None and len(positions) == page_size:
+            self.__read_ahead.schedule(result['next_index'], page_size)
+        return result
 
-        data = []
-        current_index = index
-        indexed_dataset = self.indexed_dataset()
-        next_index = index
+    def __read_page(self, index: int, page_size: int,
+                    view: Optional[Tuple[Dict[int, List], LiveIndex]] = None
+                    ) -> Optional[Tuple[List[int], Dict]]:
+        """
+        Build the get_hyper_index page starting at a dataset position.
 
-        while len(data) < page_size and next_index < len(indexed_dataset):
-            if next_index in indexed_dataset:
-                data.append(indexed_dataset[next_index])
-            next_index += 1
+        Args:
+            view: The indexed dataset and live index, when the caller
+                already resolved them under the lock.
 
-        return {
+        Returns:
+            Tuple[List[int], Dict]: The positions of the rows on the page
+            and the pagination dictionary, or None if index is past the
+            end of the data.
+        """
+        with self.__lock:
+            indexed_dataset, live = view or self.__view()
+            if index >= live.size:
+                return None
+            data = []
+            positions = []
+            next_index = index
+            rank = live.rank(index)
+
+            while len(data) < page_size and rank < len(live):
+                position = live.select(rank)
+                if position in indexed_dataset:
+                    data.append(indexed_dataset[position])
+                    positions.append(position)
+                    rank += 1
+                else:
+                    # Deleted straight from the dict: record it in the index
+                    live.delete(position)
+                next_index = position + 1
+
+        return positions, {
             'index': index,
             'next_index': next_index,
             'page_size': len(data),
             'data': data
         }
+
+    def get_hyper_index_many(self, indexes: List[int],
+                             page_size: int = 10) -> List[Dict]:
+        """
+        Return the get_hyper_index result for several start indexes.
+
+        Pages are resolved in index order and overlapping pages reuse
+        the positions already selected, so shared gaps are skipped once.
+
+        Args:
+            indexes (List[int]): The starting index of each page.
+            page_size (int): The number of items to display on each page.
+
+        Returns:
+            List[Dict]: One pagination dictionary per index, in order.
+        """
+        with self.__lock:
+            indexed_dataset, live = self.__view()
+            for index in indexes:
+                assert isinstance(index, int) and 0 <= index < live.size, \
+                    "Index out of range"
+
+            selected = {}
+            results = {}
+            for index in sorted(set(indexes)):
+                data = []
+                next_index = index
+                rank = live.rank(index)
+                while len(data) < page_size and rank < len(live):
+                    position = selected.get(rank)
+                    if position is None:
+                        position = live.select(rank)
+                    if position in indexed_dataset:
+                        selected[rank] = position
+                        data.append(indexed_dataset[position])
+                        rank += 1
+                    else:
+                        # Deleted straight from the dict: shifts later ranks
+                        live.delete(position)
+                        selected.clear()
+                    next_index = position + 1
+                results[index] = {
+                    'index': index,
+                    'next_index': next_index,
+                    'page_size': len(data),
+                    'data': data
+                }
+        return [results[index] for index in indexes]
+
+    def iter_rows_from(self, index: int = 0) -> Iterator[List]:
+        """
+        Yield the remaining rows from a dataset position on, lazily.
+
+        Args:
+            index (int): The position to start from.
+        """
+        indexed_dataset = self.indexed_dataset()
+        for position in self.live_index().iter_live(index):
+            row = indexed_dataset.get(position)
+            if row is not None:
+                yield row
+
+    def iter_from_index(self, index: int = 0,
+                        page_size: int = 10) -> Iterator[Dict]:
+        """
+        Yield get_hyper_index pages one after another, following
+        next_index until the remaining rows are exhausted.
+
+        Args:
+            index (int): The starting index of the first page.
+            page_size (int): The number of items to display on a page.
+        """
+        assert (isinstance(page_size, int) and
+                page_size > 0), "Page size must be a positive integer."
+
+        indexed_dataset = self.indexed_dataset()
+        positions = self.live_index().iter_live(index)
+        while True:
+            data = []
+            next_index = index
+            for position in positions:
+                row = indexed_dataset.get(position)
+                next_index = position + 1
+                if row is not None:
+                    data.append(row)
+                    if len(data) == page_size:
+                        break
+            if not data:
+                return
+            yield {
+                'index': index,
+                'next_index': next_index,
+                'page_size': len(data),
+                'data': data
+            }
+            index = next_index
+
+    def export(self, sink: IO, fmt: str = "csv",
+               header: Optional[List[str]] = None, index: int = 0) -> int:
+        """
+        Stream the remaining rows to a sink with bounded memory.
+
+        Args:
+            sink (IO): A text file; open it with newline="" for CSV.
+            fmt (str): "csv" or "ndjson".
+            header (List[str]): Optional column names to write first
+                (CSV) or to key every record by (NDJSON).
+            index (int): The position to start from.
+
+        Returns:
+            int: The number of rows written.
+        """
+        assert fmt in WRITERS, "Unknown export format."
+        return WRITERS[fmt](self.iter_rows_from(index), sink, header)
+
+    def sorted_index(self, sort_by: Tuple[int, ...] = ()) -> SortedIndex:
+        """
+        Cached index of the remaining rows ordered by some columns.
+
+        Args:
+            sort_by (Tuple[int, ...]): Indexes of the columns to sort by.
+                Rows with equal keys keep their dataset order.
+        """
+        sort_by = tuple(sort_by)
+        sorted_index = self.__sorted_indexes.get(sort_by)
+        if sorted_index is None:
+            with self.__lock:
+                if sort_by not in self.__sorted_indexes:
+                    self.__sorted_indexes[sort_by] = SortedIndex(
+                        self.indexed_dataset().items(), sort_by)
+                sorted_index = self.__sorted_indexes[sort_by]
+        return sorted_index
+
+    def __cursor_secret(self) -> bytes:
+        """Return CURSOR_SECRET, drawing a random one if it is unset
+        """
+        if not self.CURSOR_SECRET:
+            with Server.__secret_lock:
+                if not self.CURSOR_SECRET:
+                    warnings.warn(
+                        "PAGINATION_CURSOR_SECRET is not set; cursors are "
+                        "signed with a random key, so they break after a "
+                        "restart and across worker processes",
+                        RuntimeWarning, stacklevel=2)
+                    type(self).CURSOR_SECRET = secrets.token_bytes(32)
+        return self.CURSOR_SECRET
+
+    def get_cursor_page(self, cursor: str = None, page_size: int = 10,
+                        sort_by: Tuple[int, ...] = ()) -> Dict:
+        """
+        Return a page of rows located by an opaque cursor.
+
+        A cursor encodes the sort key and position of the row it starts
+        after (or before), so fetching any page is one seek in a sorted
+        index and rows inserted or deleted elsewhere do not shift it.
+
+        Args:
+            cursor (str): A next_cursor or prev_cursor from a previous
+                call, or None for the first page.
+            page_size (int): The number of items per page.
+            sort_by (Tuple[int, ...]): Indexes of the columns to sort by.
+                Ignored when a cursor is given, as it carries its own.
+
+        Returns:
+            Dict: The page data with its next_cursor and prev_cursor.
+        """
+        assert (isinstance(page_size, int) and
+                page_size > 0), "Page size must be a positive integer."
+
+        forward = True
+        anchor = None
+        if cursor is not None:
+            payload = decode_cursor(cursor, self.__cursor_secret())
+            sort_by = tuple(payload["s"])
+            forward = payload["d"] == "next"
+            anchor = SortedIndex.load_entry(payload["k"])
+
+        sorted_index = self.sorted_index(sort_by)
+        entries = sorted_index.entries
+        indexed_dataset = self.indexed_dataset()
+        step = 1 if forward else -1
+        if anchor is None:
+            slot = 0
+        elif forward:
+            slot = sorted_index.after(anchor)
+        else:
+            slot = sorted_index.before(anchor) - 1
+
+        page = []
+        while len(page) < page_size and 0 <= slot < len(entries):
+            if entries[slot][1] in indexed_dataset:
+                page.append(entries[slot])
+            slot += step
+        more = any(entries[i][1] in indexed_dataset
+                   for i in range(slot, len(entries) if forward else -1, step))
+        if not forward:
+            page.reverse()
+
+        def make_cursor(entry, direction):
+            return encode_cursor({
+                "s": list(sort_by),
+                "k": SortedIndex.dump_entry(entry),
+                "d": direction,
+            }, self.__cursor_secret())
+
+        if forward:
+            has_next, has_prev = more, anchor is not None
+        else:
+            has_next, has_prev = anchor is not None, more
+        first = page[0] if page else anchor
+        last = page[-1] if page else anchor
+        return {
+            'page_size': len(page),
+            'data': [indexed_dataset[position] for _, position in page],
+            'next_cursor': (make_cursor(last, "next")
+                            if has_next and last else None),
+            'prev_cursor': (make_cursor(first, "prev")
+                            if has_prev and first else None),
+        }
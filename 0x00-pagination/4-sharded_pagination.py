@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+This module provides a Server paginating a dataset partitioned into
+several CSV files, such as one file per year of birth.
+"""
+import os
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from secondary_index import SecondaryIndex
+from sharded import ShardedDataset
+from storage import SourceTracker
+
+Server = __import__('2-hypermedia_pagination').Server
+
+
+class ShardedServer(Server):
+    """Server treating an ordered set of CSV shards as one dataset.
+
+    Pages, hypermedia information and filters work as in Server; a
+    page only loads the shards its rows come from.
+    """
+    DATA_FILES = ["Popular_Baby_Names.csv"]
+
+    def __init__(self, shards: Optional[Sequence[str]] = None,
+                 backend: str = "list", indexes: Tuple[str, ...] = (),
+                 auto_refresh: bool = False,
+                 counts: Optional[Sequence[int]] = None):
+        """
+        Args:
+            shards (Sequence[str]): The shard files in dataset order,
+                DATA_FILES by default.
+            backend (str): "list", "index" or "columnar", used for every
+                shard.
+            indexes (Tuple[str, ...]): Columns of INDEX_COLUMNS to build
+                secondary indexes on, enabling filtered pages. Building
+                them loads every shard.
+            auto_refresh (bool): Check the shards for changes whenever
+                the dataset is accessed. Always on with the "index"
+                backend, which reads rows from the files themselves.
+            counts (Sequence[int]): Known row count of every shard, to
+                skip counting them on first use.
+        """
+        super().__init__(backend, indexes, auto_refresh=auto_refresh)
+        self.shards = list(shards if shards is not None else self.DATA_FILES)
+        assert counts is None or len(counts) == len(self.shards), \
+            "One count per shard."
+        self.counts = None if counts is None else list(counts)
+        self.__dataset = None
+        self.__trackers = None
+        self.__secondary_index = None
+        self.__load_duration = None
+        self.__lock = threading.RLock()
+
+    @property
+    def load_duration(self) -> Optional[float]:
+        """Seconds spent counting the rows of the shards, None until then
+        """
+        return self.__load_duration
+
+    def __load(self):
+        """Count the rows of the shards, then swap the dataset in
+        """
+        started = time.perf_counter()
+        # Sizes taken first: a shard growing during the scan is seen as
+        # changed by the next refresh()
+        trackers = [SourceTracker(path, os.path.getsize(path))
+                    for path in self.shards]
+        dataset = ShardedDataset(self.shards, self.backend, self.counts)
+        self.__trackers = trackers
+        self.__load_duration = time.perf_counter() - started
+        self.__dataset = dataset
+
+    def dataset(self) -> ShardedDataset:
+        """Cached sharded dataset
+        """
+        if self.auto_refresh or self.backend == "index":
+            self.refresh()
+        # Read once: refresh() may swap in another dataset meanwhile
+        dataset = self.__dataset
+        if dataset is None:
+            with self.__lock:
+                if self.__dataset is None:
+                    self.__load()
+                dataset = self.__dataset
+        return dataset
+
+    def refresh(self) -> int:
+        """
+        Pick up changes made to the shards since they were counted.
+
+        Rows appended to a shard shift the positions of every later
+        shard, so the changed shards are counted again, the prefix sums
+        updated from the first of them on, and the secondary indexes
+        rebuilt. The changed shards are loaded again on first use; the
+        others stay loaded.
+
+        Returns:
+            int: The number of rows added, or the number of rows after
+            a shard was truncated or rewritten.
+        """
+        with self.__lock:
+            if self.__dataset is None:
+                return 0
+            changes = [tracker.poll() for tracker in self.__trackers]
+            changed = [number for number, change in enumerate(changes)
+                       if change != "unchanged"]
+            if not changed:
+                return 0
+            trackers = list(self.__trackers)
+            for number in changed:
+                path = self.shards[number]
+                trackers[number] = SourceTracker(path,
+                                                 os.path.getsize(path))
+            before = len(self.__dataset)
+            dataset = self.__dataset.reload(changed)
+            self.__secondary_index = None
+            self.__trackers = trackers
+            self.__dataset = dataset
+            if "rewritten" in changes:
+                return len(dataset)
+            return len(dataset) - before
+
+    def secondary_index(self) -> SecondaryIndex:
+        """Cached posting lists over the columns chosen at construction
+        """
+        # Read once: refresh() may reset it meanwhile
+        secondary_index = self.__secondary_index
+        if secondary_index is None:
+            with self.__lock:
+                if self.__secondary_index is None:
+                    self.__secondary_index = SecondaryIndex(self.dataset(), {
+                        name: self.INDEX_COLUMNS[name]
+                        for name in self.indexes})
+                secondary_index = self.__secondary_index
+        return secondary_index
+
+    def shard_row_counts(self) -> List[int]:
+        """Number of rows in every shard
+        """
+        return list(self.dataset().counts)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmarks for the pagination Servers.
+
+Synthetic baby-name CSVs are generated (and reused) for every requested
+size, then each scenario runs in a fresh interpreter so cold-load time
+and peak RSS are measured in isolation. Results are printed as JSON.
+
+Usage:
+    ./benchmark.py --rows 10000 1000000 10000000 --out results.json
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name",
+          "Count", "Rank"]
+ETHNICITIES = ["ASIAN AND PACIFIC ISLANDER", "BLACK NON HISPANIC",
+               "HISPANIC", "WHITE NON HISPANIC"]
+SAMPLES = 200
+PAGE_SIZE = 10
+
+
+def generate_csv(path: str, rows: int, seed: int = 0):
+    """
+    Write a synthetic Popular_Baby_Names-like CSV.
+
+    Args:
+        path (str): Destination file.
+        rows (int): Number of data rows.
+        seed (int): Random seed, so files are reproducible.
+    """
+    rng = random.Random(seed)
+    names = ["{}{}".format(rng.choice("ABCDEFGHIJKLMNOPRSTVWZ"),
+                           "".join(rng.choice("aeiounlrst")
+                                   for _ in range(rng.randint(2, 7))))
+             for _ in range(5000)]
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for _ in range(rows):
+            writer.writerow([
+                rng.randint(2011, 2019), rng.choice(("FEMALE", "MALE")),
+                rng.choice(ETHNICITIES), rng.choice(names),
+                rng.randint(10, 300), rng.randint(1, 100)])
+    os.replace(tmp, path)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Return the p50 and p99 of latencies, in microseconds."""
+    ordered = sorted(samples)
+
+    def at(q):
+        return round(ordered[min(len(ordered) - 1,
+                                 int(q * len(ordered)))] * 1e6, 2)
+    return {"p50_us": at(0.50), "p99_us": at(0.99)}
+
+
+def measure(call: Callable[[int], object],
+            arguments: List[int]) -> Dict[str, float]:
+    """Time call(argument) for every argument."""
+    samples = []
+    for argument in arguments:
+        started = time.perf_counter()
+        call(argument)
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10),
+                 1)
+
+
+def run_scenario(scenario: Dict) -> Dict:
+    """Run one scenario in the current process and return its metrics."""
+    sys.path.insert(0, HERE)
+    rng = random.Random(1)
+    result = dict(scenario)
+    module = __import__(scenario["module"])
+    pages = max(1, scenario["rows"] // PAGE_SIZE)
+    shallow = [rng.randint(1, min(10, pages)) for _ in range(SAMPLES)]
+    deep = [rng.randint(max(1, pages - 10), pages) for _ in range(SAMPLES)]
+    if scenario["module"] == "0-simple_helper_function":
+        result["index_range"] = {
+            "shallow": measure(lambda p: module.index_range(p, PAGE_SIZE),
+                               shallow),
+            "deep": measure(lambda p: module.index_range(p, PAGE_SIZE),
+                            deep),
+        }
+        return result
+
+    module.Server.DATA_FILE = scenario["data_file"]
+    server = module.Server(**scenario.get("kwargs", {}))
+    started = time.perf_counter()
+    total = len(server.dataset())
+    if scenario["module"] == "3-hypermedia_del_pagination":
+        server.indexed_dataset()
+        server.live_index()
+    result["cold_load_s"] = round(time.perf_counter() - started, 4)
+
+    if scenario["module"] == "3-hypermedia_del_pagination":
+        deleted = int(total * scenario.get("delete_fraction", 0))
+        started = time.perf_counter()
+        for position in rng.sample(range(total), deleted):
+            server.delete(position)
+        result["deleted"] = deleted
+        result["delete_s"] = round(time.perf_counter() - started, 4)
+        # Indexes are dataset positions, deleted ones included
+        limit = server.live_index().size
+        result["get_hyper_index"] = {
+            "shallow": measure(
+                lambda i: server.get_hyper_index(i, PAGE_SIZE),
+                [rng.randrange(min(100, limit)) for _ in range(SAMPLES)]),
+            "deep": measure(
+                lambda i: server.get_hyper_index(i, PAGE_SIZE),
+                [rng.randrange(max(0, limit - 100), limit)
+                 for _ in range(SAMPLES)]),
+        }
+        live_pages = max(1, server.live_count() // PAGE_SIZE)
+        result["get_hyper"] = {
+            "shallow": measure(lambda p: server.get_hyper(p, PAGE_SIZE),
+                               shallow),
+            "deep": measure(lambda p: server.get_hyper(p, PAGE_SIZE),
+                            [min(p, live_pages) for p in deep]),
+        }
+    else:
+        for name in ("get_page", "get_hyper"):
+            method = getattr(server, name, None)
+            if method is None:
+                continue
+            result[name] = {
+                "shallow": measure(lambda p: method(p, PAGE_SIZE), shallow),
+                "deep": measure(lambda p: method(p, PAGE_SIZE), deep),
+            }
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def scenarios_for(data_file: str, rows: int) -> List[Dict]:
+    """List the scenarios run against one generated dataset."""
+    base = {"rows": rows, "data_file": data_file}
+    scenarios = [dict(base, module="0-simple_helper_function")]
+    for backend in ("list", "index", "columnar"):
+        scenarios.append(dict(base, module="2-hypermedia_pagination",
+                              kwargs={"backend": backend}))
+    for fraction in (0.0, 0.1, 0.5):
+        scenarios.append(dict(base, module="3-hypermedia_del_pagination",
+                              delete_fraction=fraction))
+    return scenarios
+
+
+def main():
+    """Generate the datasets, run every scenario and report JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, nargs="+",
+                        default=[10000, 1000000, 10000000])
+    parser.add_argument("--data-dir", default=os.path.join(HERE,
+                                                           "bench_data"))
+    parser.add_argument("--out", help="Also write the results here.")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(json.loads(args.scenario))))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    for rows in args.rows:
+        data_file = os.path.join(args.data_dir,
+                                 "baby_names_{}.csv".format(rows))
+        if not os.path.exists(data_file):
+            generate_csv(data_file, rows)
+        for scenario in scenarios_for(data_file, rows):
+            child = subprocess.run(
+                [sys.executable, os.path.abspath(__file__),
+                 "--scenario", json.dumps(scenario)],
+                cwd=HERE, capture_output=True, text=True)
+            if child.returncode:
+                scenario["error"] = child.stderr.strip().splitlines()[-1]
+                results.append(scenario)
+            else:
+                results.append(json.loads(child.stdout))
+            print(json.dumps(results[-1]), file=sys.stderr)
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "page_size": PAGE_SIZE,
+        "samples": SAMPLES,
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+This module provides a compact, column-oriented in-memory layout for
+the pagination dataset.
+"""
+import csv
+from array import array
+from typing import Iterable, List, Union
+
+
+def _is_canonical_int(value: str) -> bool:
+    """Return whether value round-trips exactly through int()."""
+    try:
+        return str(int(value)) == value
+    except ValueError:
+        return False
+
+
+def _narrowest(codes: array, cardinality: int) -> array:
+    """Return the codes in the smallest unsigned typecode that fits."""
+    for typecode in ("B", "H"):
+        if cardinality <= 1 << (8 * array(typecode).itemsize):
+            return array(typecode, codes)
+    return codes
+
+
+class ColumnarDataset:
+    """Dataset stored one typed array per CSV column.
+
+    Every column is dictionary-encoded: each distinct string is kept once
+    and rows hold a small integer code per cell. High-cardinality
+    columns made only of canonical integers are stored as an int64
+    array instead. Rows are only built back into lists when sliced.
+    """
+
+    def __init__(self, rows: Iterable[List[str]]):
+        """
+        Encode rows column by column.
+
+        Args:
+            rows (Iterable[List[str]]): The rows to store, header excluded.
+        """
+        lookups = []
+        values = []
+        columns = []
+        widths = array("H")
+        ragged = False
+        for row in rows:
+            width = len(row)
+            while len(columns) < width:
+                # A column appearing late is padded with "" in older rows
+                padded = 1 if widths else 0
+                lookups.append({"": 0} if padded else {})
+                values.append([""] * padded)
+                columns.append(array("I", [0]) * len(widths))
+            if width != len(columns):
+                ragged = True
+            widths.append(width)
+            for col in range(len(columns)):
+                value = row[col] if col < width else ""
+                code = lookups[col].get(value)
+                if code is None:
+                    code = lookups[col][value] = len(values[col])
+                    values[col].append(value)
+                columns[col].append(code)
+        self.length = len(widths)
+        self.widths = widths if ragged else None
+        self.columns = [self._pack(codes, distinct)
+                        for codes, distinct in zip(columns, values)]
+        # Value-to-code maps, rebuilt per column on the first extend()
+        self._lookups = [None] * len(self.columns)
+
+    @staticmethod
+    def _pack(codes: array, values: List[str]) -> tuple:
+        """
+        Pick the cheapest storage for one column.
+
+        Returns:
+            tuple: (codes, values), where values is None when the column
+            holds the integers themselves rather than dictionary codes.
+        """
+        if len(values) > 1 << 16 and all(map(_is_canonical_int, values)):
+            return array("q", (int(values[c]) for c in codes)), None
+        return _narrowest(codes, len(values)), values
+
+    @classmethod
+    def from_csv(cls, path: str, skip_header: bool = True):
+        """
+        Build a columnar dataset from a CSV file.
+
+        Args:
+            path (str): Path to the CSV file.
+            skip_header (bool): Whether the first record is a header.
+
+        Returns:
+            ColumnarDataset: The encoded dataset.
+        """
+        with open(path) as f:
+            reader = csv.reader(f)
+            if skip_header:
+                next(reader, None)
+            return cls(reader)
+
+    def to_state(self) -> tuple:
+        """Return the dataset as plain, marshal-serializable values."""
+        widths = self.widths.tobytes() if self.widths is not None else None
+        return self.length, widths, [
+            (codes.typecode, codes.tobytes(), values)
+            for codes, values in self.columns]
+
+    @classmethod
+    def from_state(cls, state: tuple):
+        """
+        Rebuild a dataset from to_state's output without re-encoding.
+
+        Args:
+            state (tuple): The value returned by to_state.
+
+        Returns:
+            ColumnarDataset: The restored dataset.
+        """
+        length, widths, columns = state
+        dataset = cls(())
+        dataset.length = length
+        if widths is not None:
+            dataset.widths = array("H")
+            dataset.widths.frombytes(widths)
+        for typecode, raw, values in columns:
+            codes = array(typecode)
+            codes.frombytes(raw)
+            dataset.columns.append((codes, values))
+        dataset._lookups = [None] * len(dataset.columns)
+        return dataset
+
+    def _encode(self, col: int, value: str):
+        """Append a value to a column, widening its storage if needed."""
+        codes, values = self.columns[col]
+        if values is None:
+            if _is_canonical_int(value):
+                codes.append(int(value))
+                return
+            # A non-integer value turns the column back into codes
+            values = sorted({str(v) for v in codes}, key=int)
+            lookup = {v: i for i, v in enumerate(values)}
+            codes = array("I", (lookup[str(v)] for v in codes))
+            self._lookups[col] = lookup
+        lookup = self._lookups[col]
+        if lookup is None:
+            lookup = self._lookups[col] = {
+                v: i for i, v in enumerate(values)}
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(values)
+            values.append(value)
+            if code >= 1 << (8 * codes.itemsize):
+                codes = array("I", codes)
+        codes.append(code)
+        self.columns[col] = (codes, values)
+
+    def extend(self, rows: Iterable[List[str]]):
+        """
+        Append rows to the dataset in place.
+
+        Args:
+            rows (Iterable[List[str]]): The rows to add.
+        """
+        for row in rows:
+            width = len(row)
+            if width != len(self.columns) and self.widths is None:
+                self.widths = array("H", [len(self.columns)]) * self.length
+            while len(self.columns) < width:
+                self.columns.append((array("B", [0]) * self.length, [""]))
+                self._lookups.append(None)
+            if self.widths is not None:
+                self.widths.append(width)
+            for col in range(len(self.columns)):
+                self._encode(col, row[col] if col < width else "")
+            self.length += 1
+
+    def __len__(self) -> int:
+        return self.length
+
+    def row(self, index: int) -> List[str]:
+        """Materialize a single row as a list of strings."""
+        row = []
+        for codes, values in self.columns:
+            if values is None:
+                row.append(str(codes[index]))
+            else:
+                row.append(values[codes[index]])
+        if self.widths is not None:
+            del row[self.widths[index]:]
+        return row
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            return [self.row(i) for i in range(*key.indices(self.length))]
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("row index out of range")
+        return self.row(key)
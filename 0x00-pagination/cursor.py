@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+This module provides signed, opaque pagination cursors and the sorted
+index they seek into.
+"""
+import base64
+import hashlib
+import hmac
+import json
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+
+def encode_cursor(payload: Dict, secret: bytes) -> str:
+    """
+    Serialize and sign a cursor payload.
+
+    Args:
+        payload (Dict): JSON-serializable cursor state.
+        secret (bytes): Key used to sign the cursor.
+
+    Returns:
+        str: A URL-safe opaque token.
+    """
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    signature = hmac.new(secret, body, hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(signature + body).decode().rstrip("=")
+
+
+def decode_cursor(token: str, secret: bytes) -> Dict:
+    """
+    Verify and deserialize a cursor produced by encode_cursor.
+
+    Args:
+        token (str): The opaque token.
+        secret (bytes): Key the cursor was signed with.
+
+    Returns:
+        Dict: The cursor payload.
+
+    Raises:
+        ValueError: If the token is malformed or its signature is invalid.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (TypeError, ValueError):
+        raise ValueError("Malformed cursor.")
+    signature, body = raw[:16], raw[16:]
+    expected = hmac.new(secret, body, hashlib.sha256).digest()[:16]
+    if not hmac.compare_digest(signature, expected):
+        raise ValueError("Invalid cursor signature.")
+    return json.loads(body)
+
+
+def sort_value(value: str) -> Tuple:
+    """Order integer strings numerically and before any other string."""
+    # str.isdigit() also accepts digits such as "²" that int() rejects
+    if value.isascii() and value.isdigit():
+        return (0, int(value))
+    return (1, value)
+
+
+class SortedIndex:
+    """Dataset positions ordered by some columns, position breaking ties.
+
+    Entries are (key, position) tuples kept sorted, so the entry following
+    any cursor key is found with a single bisection.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, List]],
+                 columns: Tuple[int, ...] = ()):
+        """
+        Args:
+            rows (Iterable[Tuple[int, List]]): (position, row) pairs.
+            columns (Tuple[int, ...]): Indexes of the columns to sort by.
+        """
+        self.columns = tuple(columns)
+        self.entries = sorted(
+            (self.key(row), position) for position, row in rows)
+
+    def key(self, row: List) -> Tuple:
+        """Return the sort key of a row."""
+        return tuple(sort_value(row[col] if col < len(row) else "")
+                     for col in self.columns)
+
+    def after(self, entry: Tuple) -> int:
+        """Return the slot of the first entry strictly after entry."""
+        return bisect_right(self.entries, entry)
+
+    def before(self, entry: Tuple) -> int:
+        """Return the slot one past the last entry strictly before entry."""
+        return bisect_left(self.entries, entry)
+
+    def extend(self, rows: Iterable[Tuple[int, List]]):
+        """
+        Add (position, row) pairs, such as rows appended to the dataset.
+
+        The batch is sorted on its own, then appended if it sorts after
+        every entry, or else merged in one pass: each new entry is
+        bisected into the entries and the runs between them are copied.
+        """
+        entries = sorted((self.key(row), position) for position, row in rows)
+        if not entries:
+            return
+        if not self.entries or self.entries[-1] < entries[0]:
+            self.entries.extend(entries)
+            return
+        merged = []
+        done = 0
+        for entry in entries:
+            slot = bisect_left(self.entries, entry, done)
+            merged.extend(self.entries[done:slot])
+            merged.append(entry)
+            done = slot
+        merged.extend(self.entries[done:])
+        # A new list: readers keep a consistent view of the old one
+        self.entries = merged
+
+    def remove(self, row: List, position: int):
+        """Drop a row at a dataset position, if present."""
+        entry = (self.key(row), position)
+        slot = bisect_left(self.entries, entry)
+        if slot < len(self.entries) and self.entries[slot] == entry:
+            del self.entries[slot]
+
+    @staticmethod
+    def dump_entry(entry: Tuple) -> List:
+        """Convert an entry to a JSON-friendly list."""
+        key, position = entry
+        return [[list(part) for part in key], position]
+
+    @staticmethod
+    def load_entry(data: List) -> Tuple:
+        """Rebuild an entry from dump_entry's output."""
+        key, position = data
+        return tuple(tuple(part) for part in key), position
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+This module writes streams of dataset rows to CSV or NDJSON sinks.
+"""
+import csv
+import json
+from itertools import count
+from typing import IO, Iterable, List, Optional
+
+
+def write_csv(rows: Iterable[List], sink: IO,
+              header: Optional[List[str]] = None) -> int:
+    """
+    Write rows to a text sink as CSV.
+
+    Args:
+        rows (Iterable[List]): The rows, consumed lazily.
+        sink (IO): A text file opened with newline="".
+        header (List[str]): Optional first record.
+
+    Returns:
+        int: The number of rows written, header excluded.
+    """
+    writer = csv.writer(sink)
+    if header is not None:
+        writer.writerow(header)
+    counter = count()
+    # zip stops on rows first, so the counter ends at the row count
+    writer.writerows(row for row, _ in zip(rows, counter))
+    return next(counter)
+
+
+def write_ndjson(rows: Iterable[List], sink: IO,
+                 header: Optional[List[str]] = None) -> int:
+    """
+    Write rows to a text sink as newline-delimited JSON.
+
+    Args:
+        rows (Iterable[List]): The rows, consumed lazily.
+        sink (IO): A text file.
+        header (List[str]): Optional column names; rows are then written
+            as objects instead of arrays.
+
+    Returns:
+        int: The number of rows written.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False,
+                              separators=(",", ":")).encode
+    written = 0
+    for row in rows:
+        record = row if header is None else dict(zip(header, row))
+        sink.write(encode(record) + "\n")
+        written += 1
+    return written
+
+
+WRITERS = {"csv": write_csv, "ndjson": write_ndjson}
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+This module provides a Fenwick tree tracking which dataset positions
+are still live, with logarithmic rank/select queries.
+"""
+from array import array
+from typing import Iterator
+
+
+class LiveIndex:
+    """Rank/select structure over the positions 0..size-1.
+
+    Every position starts live. Deleting one, counting the live positions
+    before an index (rank) and finding the position of the k-th live row
+    (select) all run in O(log n).
+    """
+
+    def __init__(self, size: int):
+        """
+        Args:
+            size (int): Number of positions, all initially live.
+        """
+        self.size = size
+        self.live = bytearray(b"\x01") * size
+        self.count = size
+        # With every position set to 1, node i covers (i & -i) positions
+        self.tree = array("I", (i & -i for i in range(size + 1)))
+        self.top = 1 << size.bit_length() if size else 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, index: int) -> bool:
+        return 0 <= index < self.size and bool(self.live[index])
+
+    def iter_live(self, start: int = 0) -> Iterator[int]:
+        """Yield the live positions from start on, in order."""
+        live = self.live
+        position = max(start, 0)
+        while position < self.size:
+            position = live.find(1, position)
+            if position == -1:
+                return
+            yield position
+            position += 1
+
+    def _add(self, index: int, delta: int):
+        """Add delta to the count stored for a 0-based position."""
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def extend(self, count: int):
+        """
+        Append live positions at the end.
+
+        Args:
+            count (int): Number of positions to add.
+        """
+        for _ in range(count):
+            i = self.size + 1
+            low = i - (i & -i)
+            # Node i covers positions low..i-1, the last one being new
+            node = 1 + self.rank(i - 1) - self.rank(low)
+            self.live.append(1)
+            self.tree.append(node)
+            self.size = i
+            self.count += 1
+        self.top = 1 << self.size.bit_length() if self.size else 0
+
+    def delete(self, index: int) -> bool:
+        """
+        Mark a position as deleted.
+
+        Args:
+            index (int): The position to delete.
+
+        Returns:
+            bool: True if the position was live, False otherwise.
+        """
+        if index not in self:
+            return False
+        self.live[index] = 0
+        self.count -= 1
+        self._add(index, -1)
+        return True
+
+    def rank(self, index: int) -> int:
+        """
+        Return the number of live positions strictly before index.
+        """
+        i = min(max(index, 0), self.size)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def select(self, k: int) -> int:
+        """
+        Return the position of the k-th live row (0-based).
+
+        Raises:
+            IndexError: If there are not more than k live positions.
+        """
+        if not 0 <= k < self.count:
+            raise IndexError("live rank out of range")
+        position = 0
+        step = self.top
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self.tree[nxt] <= k:
+                position = nxt
+                k -= self.tree[nxt]
+            step >>= 1
+        return position
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+This module prefetches the pages a sequential reader is about to ask
+for, in a background thread, into a small bounded buffer.
+"""
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+Page = Tuple[List[int], Dict]
+
+
+class ReadAheadBuffer:
+    """Pages fetched ahead of a reader following next_index.
+
+    After a page is served, schedule() asks the background thread for
+    the next pages, each one starting at the next_index of the one
+    before. Entries are keyed by (index, page_size) and keep the row
+    positions they were built from, so the caller can check them
+    against deletions before serving them. A newer request supersedes
+    the pages still being fetched for an older one.
+
+    A bound method fetch is only held weakly, so the buffer and its
+    thread do not keep its owner alive; the thread stops once the owner
+    is gone, or when the buffer is closed.
+    """
+
+    def __init__(self, fetch: Callable[[int, int], Optional[Page]],
+                 pages: int, capacity: int = 64):
+        """
+        Args:
+            fetch (Callable): Builds the page at (index, page_size),
+                returning its row positions and its dictionary, or None
+                past the end of the data.
+            pages (int): Number of pages to fetch ahead.
+            capacity (int): Maximum number of buffered pages; the oldest
+                are dropped first.
+        """
+        assert pages > 0, "Read-ahead needs at least one page."
+        try:
+            self._fetch = weakref.WeakMethod(fetch)
+        except TypeError:
+            self._fetch = lambda: fetch
+        self.pages = pages
+        self.capacity = max(capacity, pages)
+        self.buffer = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._wanted = None
+        self._closed = False
+        self._thread = None
+        self._cond = threading.Condition()
+
+    def pop(self, index: int, page_size: int) -> Optional[Page]:
+        """Remove and return the buffered page at index, if any."""
+        with self._cond:
+            page = self.buffer.pop((index, page_size), None)
+            if page is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return page
+
+    def schedule(self, index: int, page_size: int):
+        """Fetch the pages starting at index in the background."""
+        with self._cond:
+            if self._closed:
+                return
+            self._wanted = (index, page_size, self.generation)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def discard(self, position: int):
+        """Drop the buffered pages holding a row position."""
+        with self._cond:
+            stale = [key for key, (_, page) in self.buffer.items()
+                     if key[0] <= position < page["next_index"]]
+            for key in stale:
+                del self.buffer[key]
+
+    def invalidate(self):
+        """Drop every buffered page, and the pages being fetched."""
+        with self._cond:
+            self.generation += 1
+            self.buffer.clear()
+            self._wanted = None
+
+    def close(self):
+        """Stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self.buffer.clear()
+            self._cond.notify()
+
+    def _run(self):
+        """Background loop serving the latest scheduled request."""
+        while True:
+            with self._cond:
+                while self._wanted is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                index, page_size, generation = self._wanted
+                self._wanted = None
+
+            for _ in range(self.pages):
+                with self._cond:
+                    page = self.buffer.get((index, page_size))
+                if page is None:
+                    fetch = self._fetch()
+                    if fetch is None:
+                        return
+                    page = fetch(index, page_size)
+                    # No strong reference to the owner while waiting
+                    del fetch
+                    if page is None:
+                        break
+                    with self._cond:
+                        if (generation != self.generation or
+                                self._wanted is not None or self._closed):
+                            break
+                        self.buffer[(index, page_size)] = page
+                        while len(self.buffer) > self.capacity:
+                            self.buffer.popitem(last=False)
+                positions, result = page
+                if len(positions) < page_size:
+                    break
+                index = result["next_index"]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+This module provides a byte-offset row index over a CSV file so pages
+can be read straight from a memory-mapped file instead of parsing the
+whole dataset into memory.
+"""
+import csv
+import io
+import mmap
+import os
+from array import array
+from typing import List, Optional, Union
+
+BLOCK_SIZE = 1 << 20  # Bytes read at a time by count_records
+
+
+def count_records(path: str, skip_header: bool = True) -> int:
+    """
+    Count the records of a CSV file as RowIndex does, without keeping
+    their offsets: a newline inside a quoted field does not end one.
+
+    The file is read in blocks split on quotes, so newlines are counted
+    by bytes.count instead of line by line.
+    """
+    starts = 0  # Newlines outside quotes, then record starts
+    in_quotes = False
+    last = b""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            for i, part in enumerate(block.split(b'"')):
+                if i:
+                    in_quotes = not in_quotes
+                if not in_quotes:
+                    starts += part.count(b"\n")
+            last = block[-1:]
+    if last:
+        # The first line starts a record; a final newline starts none
+        starts += 1
+        if last == b"\n" and not in_quotes:
+            starts -= 1
+    if skip_header:
+        return max(starts - 1, 0)
+    return starts
+
+
+class RowIndex:
+    """Row-offset table over a CSV file, read through mmap.
+
+    The file is scanned once to record the byte offset at which every
+    row starts. Quoted fields spanning several lines are handled, so an
+    index entry always points at the start of a full CSV record.
+    """
+
+    def __init__(self, path: str, skip_header: bool = True,
+                 offsets: Optional[array] = None):
+        """
+        Build (or reuse) the offset table for a CSV file.
+
+        Args:
+            path (str): Path to the CSV file.
+            skip_header (bool): Whether the first record is a header.
+            offsets (array): A previously built offset table to reuse,
+                such as one loaded from a snapshot.
+        """
+        self.path = path
+        self.skip_header = skip_header
+        self.offsets = offsets
+        if self.offsets is None:
+            self.offsets = self._scan()
+        self._file = open(path, "rb")
+        self._mmap = None
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+
+    def _scan(self) -> array:
+        """Return the start offset of every record plus the end offset."""
+        offsets = array("Q")
+        position = 0
+        in_quotes = False
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not in_quotes:
+                    offsets.append(position)
+                position += len(line)
+                if line.count(b'"') & 1:
+                    in_quotes = not in_quotes
+        offsets.append(position)
+        if self.skip_header and len(offsets) > 1:
+            del offsets[0]
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def extend(self, offsets: List[int]):
+        """
+        Add records appended to the file since the index was built.
+
+        Args:
+            offsets (List[int]): Start offset of every new record plus
+                the end offset; the first must equal the current end.
+        """
+        assert offsets[0] == self.offsets[-1], "Offsets do not line up."
+        self.offsets.extend(offsets[1:])
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+
+    def rows(self, start: int, end: int) -> List[List]:
+        """
+        Parse and return the records in the range [start, end).
+
+        Args:
+            start (int): Index of the first row.
+            end (int): Index one past the last row.
+
+        Returns:
+            List[List]: The parsed rows, as csv.reader would return them.
+        """
+        start = max(0, min(start, len(self)))
+        end = max(start, min(end, len(self)))
+        if start == end:
+            return []
+        # Reading mapped bytes past the end of the file raises SIGBUS
+        if os.fstat(self._file.fileno()).st_size < self.offsets[end]:
+            raise RuntimeError(
+                "{} was truncated after it was indexed".format(self.path))
+        chunk = self._mmap[self.offsets[start]:self.offsets[end]]
+        return list(csv.reader(io.StringIO(chunk.decode("utf-8"),
+                                           newline="")))
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            start, end, step = key.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, end, step)]
+            return self.rows(start, end)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("row index out of range")
+        return self.rows(key, key + 1)[0]
+
+    def close(self):
+        """Release the memory map and the underlying file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+This module provides secondary indexes (posting lists) over chosen
+columns of the pagination dataset, used to paginate filtered views.
+"""
+import threading
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from typing import Dict, Iterable, List, Sequence
+
+from storage import iter_rows
+
+
+def _contains(postings: array, position: int) -> bool:
+    """Return whether a sorted posting list holds a position."""
+    slot = bisect_left(postings, position)
+    return slot < len(postings) and postings[slot] == position
+
+
+def _append(lists: Dict[str, array], value: str, position: int):
+    """Append a position to the posting list of a value."""
+    if value not in lists:
+        lists[value] = array("I")
+    lists[value].append(position)
+
+
+class SecondaryIndex:
+    """Posting lists of row positions per value of some columns.
+
+    Values are matched case-insensitively. The name column is also
+    indexed by its first prefix_length characters, so a short name
+    prefix is resolved from one or a few posting lists, and a longer
+    one by merging the lists of the names starting with it.
+    Intersections are cached with their length, so the total of a
+    filtered view is O(1) once it has been computed.
+    """
+
+    MAX_CACHED_VIEWS = 256
+
+    def __init__(self, dataset: Sequence[List], columns: Dict[str, int],
+                 prefix_length: int = 1):
+        """
+        Args:
+            dataset (Sequence[List]): The rows to index.
+            columns (Dict[str, int]): Filter name to column index. The
+                filter named "name" is indexed by prefix too.
+            prefix_length (int): Characters of a name to index.
+        """
+        self.dataset = dataset
+        self.columns = dict(columns)
+        self.prefix_length = prefix_length
+        self.postings = {name: {} for name in self.columns}
+        self.prefixes = {}  # Name prefix to positions
+        self.views = {}
+        self._lock = threading.Lock()  # Guards views
+        self.extend(0, iter_rows(dataset))
+
+    def extend(self, start: int, rows: Iterable[List]):
+        """
+        Index rows appended to the dataset.
+
+        Args:
+            start (int): Position of the first row.
+            rows (Iterable[List]): The rows, in dataset order.
+        """
+        for position, row in enumerate(rows, start):
+            for name, col in self.columns.items():
+                value = (row[col] if col < len(row) else "").casefold()
+                _append(self.postings[name], value, position)
+                if name == "name":
+                    _append(self.prefixes, value[:self.prefix_length],
+                            position)
+        with self._lock:
+            self.views.clear()
+
+    def count(self, name: str, value) -> int:
+        """Return the number of rows whose column equals value."""
+        return len(self.postings[name].get(str(value).casefold(), ()))
+
+    def _prefix_postings(self, prefix: str) -> array:
+        """Return the sorted positions of names starting with prefix."""
+        prefix = prefix.casefold()
+        if len(prefix) <= self.prefix_length:
+            lists = self.prefixes
+        else:
+            lists = self.postings["name"]
+        keys = [k for k in lists if k.startswith(prefix)]
+        if len(keys) == 1:
+            return lists[keys[0]]
+        return array("I", merge(*(lists[k] for k in keys)))
+
+    def lookup(self, **filters) -> array:
+        """
+        Return the sorted positions of rows matching every filter.
+
+        Args:
+            **filters: Column values keyed by filter name, plus an
+                optional name_prefix.
+
+        Returns:
+            array: The matching row positions, in dataset order.
+        """
+        key = tuple(sorted((k, str(v).casefold())
+                           for k, v in filters.items()))
+        with self._lock:
+            result = self.views.get(key)
+        if result is not None:
+            return result
+
+        postings = []
+        for name, value in key:
+            if name == "name_prefix":
+                assert "name" in self.columns, "Column is not indexed."
+                postings.append(self._prefix_postings(value))
+            else:
+                assert name in self.columns, "Column is not indexed."
+                postings.append(self.postings[name].get(value,
+                                                        array("I")))
+        postings.sort(key=len)
+        result = postings[0] if postings else array(
+            "I", range(len(self.dataset)))
+        if len(postings) > 1:
+            result = array("I", (
+                position for position in result
+                if all(_contains(other, position)
+                       for other in postings[1:])))
+
+        with self._lock:
+            if len(self.views) >= self.MAX_CACHED_VIEWS:
+                del self.views[next(iter(self.views))]
+            self.views[key] = result
+        return result
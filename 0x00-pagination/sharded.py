@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+This module presents an ordered set of CSV shards as one dataset,
+loading a shard only when one of its rows is requested.
+"""
+import copy
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Optional, Sequence, Union
+
+from row_index import count_records
+from storage import load_dataset
+
+
+class ShardedDataset:
+    """Sliceable sequence of rows spread over several CSV files.
+
+    Every shard is scanned once for its record count, without parsing
+    it or keeping it open, giving a prefix-sum table that maps a global
+    row index to its shard in O(log shards). A shard is only opened,
+    and its rows loaded with the chosen backend, the first time a slice
+    touches it.
+    """
+
+    def __init__(self, paths: Sequence[str], backend: str = "list",
+                 counts: Optional[Sequence[int]] = None):
+        """
+        Args:
+            paths (Sequence[str]): The shard files, in dataset order.
+                Each one has its own header row.
+            backend (str): Storage backend used to load a shard.
+            counts (Sequence[int]): Known row count of every shard, to
+                skip the initial scan.
+        """
+        self.paths = list(paths)
+        self.backend = backend
+        self.shards = [None] * len(self.paths)
+        if counts is None:
+            counts = [count_records(path) for path in self.paths]
+        assert len(counts) == len(self.paths), "One count per shard."
+        self.counts = list(counts)
+        self.prefix = array("Q", accumulate(self.counts, initial=0))
+        self._lock = threading.Lock()
+
+    def reload(self, numbers: Iterable[int]) -> "ShardedDataset":
+        """
+        Return a copy of the dataset in which some shards changed.
+
+        Those shards are counted again and loaded again on first use,
+        and the prefix sums are only recomputed from the first of them
+        on; the other shards are shared with this dataset.
+        """
+        numbers = sorted(set(numbers))
+        dataset = copy.copy(self)
+        dataset.shards = list(self.shards)
+        dataset.counts = list(self.counts)
+        dataset._lock = threading.Lock()
+        for number in numbers:
+            dataset.shards[number] = None
+            dataset.counts[number] = count_records(self.paths[number])
+        if numbers:
+            first = numbers[0]
+            dataset.prefix = self.prefix[:first + 1]
+            for count in dataset.counts[first:]:
+                dataset.prefix.append(dataset.prefix[-1] + count)
+        return dataset
+
+    def __len__(self) -> int:
+        return self.prefix[-1]
+
+    def locate(self, index: int) -> int:
+        """Return the shard holding a global row index."""
+        return bisect_right(self.prefix, index) - 1
+
+    def shard(self, number: int) -> Sequence[List]:
+        """Return the rows of a shard, loading it on first use."""
+        if self.shards[number] is None:
+            with self._lock:
+                if self.shards[number] is None:
+                    self.shards[number] = load_dataset(self.paths[number],
+                                                       self.backend)
+        return self.shards[number]
+
+    def loaded(self) -> List[int]:
+        """Return the numbers of the shards loaded so far."""
+        return [i for i, shard in enumerate(self.shards) if shard is not None]
+
+    def rows(self, start: int, end: int) -> List[List]:
+        """
+        Return the rows in the global range [start, end).
+
+        Only the shards overlapping the range are loaded.
+        """
+        start = max(0, min(start, len(self)))
+        end = max(start, min(end, len(self)))
+        rows = []
+        number = self.locate(start) if start < end else len(self.paths)
+        while start < end:
+            base = self.prefix[number]
+            stop = min(end, self.prefix[number + 1])
+            if stop > start:
+                rows.extend(self.shard(number)[start - base:stop - base])
+            start = stop
+            number += 1
+        return rows
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            start, end, step = key.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, end, step)]
+            return self.rows(start, end)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("row index out of range")
+        return self.rows(key, key + 1)[0]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+This module helps share one loaded dataset between the worker
+processes of a pre-fork server, through copy-on-write memory.
+
+Worker processes forked after preload_for_fork() read the master's
+dataset instead of building their own. The "index" backend (an
+mmap of the CSV plus an offset array) and the "columnar" backend (typed
+arrays) keep rows out of Python objects, so reading them in a worker
+does not write reference counts into the shared pages.
+"""
+import gc
+from collections.abc import MutableMapping
+from typing import Iterator, List, Sequence, Tuple
+
+from live_index import LiveIndex
+from storage import CHUNK_SIZE
+
+
+class RowMap(MutableMapping):
+    """Position-to-row mapping over a dataset and a LiveIndex.
+
+    It stands in for the dict of indexed_dataset() without one Python
+    object per row: a position is present while it is live, reading it
+    reads the underlying storage, and deleting it marks it dead.
+    """
+
+    def __init__(self, dataset: Sequence[List], live: LiveIndex):
+        """
+        Args:
+            dataset (Sequence[List]): The rows, by position.
+            live (LiveIndex): Liveness of every position.
+        """
+        self.dataset = dataset
+        self.live = live
+
+    def __getitem__(self, position: int) -> List:
+        if position not in self.live:
+            raise KeyError(position)
+        return self.dataset[position]
+
+    def __setitem__(self, position: int, row: List):
+        raise TypeError("RowMap rows come from the underlying dataset.")
+
+    def __delitem__(self, position: int):
+        if not self.live.delete(position):
+            raise KeyError(position)
+
+    def __contains__(self, position) -> bool:
+        return isinstance(position, int) and position in self.live
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+    def __iter__(self) -> Iterator[int]:
+        return self.live.iter_live()
+
+    def items(self) -> Iterator[Tuple[int, List]]:
+        """Yield (position, row) pairs, reading rows chunk by chunk."""
+        for start in range(0, self.live.size, CHUNK_SIZE):
+            rows = self.dataset[start:start + CHUNK_SIZE]
+            for position in self.live.iter_live(start):
+                if position >= start + len(rows):
+                    break
+                yield position, rows[position - start]
+
+
+def preload_for_fork(*servers):
+    """
+    Fully load servers in the master process before forking workers.
+
+    Every lazily built structure is built now, then the surviving
+    objects are moved to the permanent GC generation, so the workers'
+    garbage collections do not touch (and copy) the shared pages.
+
+    Args:
+        *servers: Server instances to prepare.
+    """
+    for server in servers:
+        server.dataset()
+        if hasattr(server, "indexed_dataset"):
+            server.indexed_dataset()
+            server.live_index()
+        if getattr(server, "indexes", ()):
+            server.secondary_index()
+    gc.collect()
+    gc.freeze()
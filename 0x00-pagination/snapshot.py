@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+This module provides versioned binary snapshots of a parsed dataset,
+keyed by the size, mtime and hash of the CSV file they were built from.
+"""
+import gc
+import hashlib
+import json
+import marshal
+import os
+import struct
+from typing import Any, Dict, Optional
+
+SNAPSHOT_MAGIC = b"PGSNAP"
+SNAPSHOT_VERSION = 1
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_signature(path: str, digest: bool = True) -> Dict[str, Any]:
+    """
+    Describe the current state of a source file.
+
+    Args:
+        path (str): Path to the source file.
+        digest (bool): Whether to include the (costly) content hash.
+
+    Returns:
+        Dict: The file's size, mtime and optionally its hash.
+    """
+    st = os.stat(path)
+    signature = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if digest:
+        signature["sha256"] = file_digest(path)
+    return signature
+
+
+def save_snapshot(path: str, source: str, kind: str, state: Any,
+                  signature: Optional[Dict[str, Any]] = None):
+    """
+    Write a snapshot of a parsed dataset.
+
+    Args:
+        path (str): Path of the snapshot file.
+        source (str): Path of the CSV file the state was built from.
+        kind (str): Storage backend the state belongs to.
+        state: marshal-serializable dataset state.
+        signature (Dict): source_signature() of the source taken
+            before it was parsed, or None to take it now.
+    """
+    if signature is None:
+        signature = source_signature(source)
+    header = dict(signature, version=SNAPSHOT_VERSION, kind=kind)
+    encoded = json.dumps(header).encode()
+    tmp = "{}.tmp{}".format(path, os.getpid())
+    with open(tmp, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack("<I", len(encoded)))
+        f.write(encoded)
+        marshal.dump(state, f)
+    os.replace(tmp, path)
+
+
+def load_snapshot(path: str, source: str, kind: str) -> Optional[Any]:
+    """
+    Read a snapshot if it is still valid for its source file.
+
+    A snapshot is valid when its format version and backend match and
+    the source has the same size and mtime. If only the mtime differs,
+    the source is hashed and the snapshot kept if the content matches.
+
+    Args:
+        path (str): Path of the snapshot file.
+        source (str): Path of the CSV file.
+        kind (str): Storage backend expected in the snapshot.
+
+    Returns:
+        The stored state, or None if the snapshot is missing or stale.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                return None
+            size, = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(size))
+            if (header.get("version") != SNAPSHOT_VERSION or
+                    header.get("kind") != kind):
+                return None
+            current = source_signature(source, digest=False)
+            if current["size"] != header["size"]:
+                return None
+            if (current["mtime_ns"] != header["mtime_ns"] and
+                    file_digest(source) != header["sha256"]):
+                return None
+            # Building millions of containers triggers needless GC passes
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return marshal.loads(f.read())
+            finally:
+                if enabled:
+                    gc.enable()
+    except (OSError, ValueError, EOFError, TypeError, KeyError,
+            struct.error):
+        return None
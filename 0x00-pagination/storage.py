@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+This module loads the pagination dataset with one of the storage
+backends, optionally through a binary snapshot, and picks up rows
+appended to the source file afterwards.
+"""
+import csv
+import io
+import os
+import threading
+import time
+from array import array
+from itertools import islice
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from columnar import ColumnarDataset
+from parallel_csv import parse_parallel, parse_range
+from row_index import RowIndex
+from snapshot import load_snapshot, save_snapshot, source_signature
+
+BACKENDS = ("list", "index", "columnar")
+CHUNK_SIZE = 65536
+
+
+def parse_dataset(path: str, backend: str = "list",
+                  workers: int = 1) -> Sequence[List]:
+    """
+    Parse a CSV file, skipping its header.
+
+    Args:
+        path (str): Path to the CSV file.
+        backend (str): "list" returns a list of rows, "index" a RowIndex
+            reading rows from an mmap, "columnar" a ColumnarDataset.
+        workers (int): Processes parsing the file in parallel chunks.
+
+    Returns:
+        Sequence[List]: The rows, as a sliceable sequence.
+    """
+    if backend == "index":
+        # Only row offsets are kept; pages are parsed on demand
+        return RowIndex(path)
+    if workers > 1:
+        dataset = parse_parallel(path, workers)[1:]  # Skip the header
+        if backend == "columnar":
+            return ColumnarDataset(dataset)
+        return dataset
+    if backend == "columnar":
+        return ColumnarDataset.from_csv(path)
+    with open(path) as f:
+        reader = csv.reader(f)
+        dataset = [row for row in reader]
+    return dataset[1:]  # Skip the header
+
+
+def dataset_state(dataset: Sequence[List], backend: str) -> Any:
+    """Return the marshal-serializable state of a loaded dataset."""
+    if backend == "index":
+        return dataset.offsets.tobytes()
+    if backend == "columnar":
+        return dataset.to_state()
+    return dataset
+
+
+def restore_dataset(state: Any, path: str, backend: str) -> Sequence[List]:
+    """Rebuild a dataset from dataset_state's output."""
+    if backend == "index":
+        offsets = array("Q")
+        offsets.frombytes(state)
+        return RowIndex(path, offsets=offsets)
+    if backend == "columnar":
+        return ColumnarDataset.from_state(state)
+    return state
+
+
+def load_dataset(path: str, backend: str = "list",
+                 snapshot: Optional[str] = None,
+                 workers: int = 1) -> Sequence[List]:
+    """
+    Load a dataset, reusing a binary snapshot when it is still valid.
+
+    Args:
+        path (str): Path to the CSV file.
+        backend (str): One of BACKENDS.
+        snapshot (str): Optional path of the snapshot file. A stale or
+            missing snapshot is (re)written after parsing the CSV,
+            unless the CSV changed during the parse.
+        workers (int): Processes parsing the CSV in parallel chunks.
+
+    Returns:
+        Sequence[List]: The rows, as a sliceable sequence.
+    """
+    assert backend in BACKENDS, "Unknown backend."
+    if snapshot is not None:
+        state = load_snapshot(snapshot, path, backend)
+        if state is not None:
+            return restore_dataset(state, path, backend)
+    if snapshot is None:
+        return parse_dataset(path, backend, workers)
+    # Signed before parsing: a snapshot must not claim rows it lacks
+    signature = source_signature(path)
+    dataset = parse_dataset(path, backend, workers)
+    current = source_signature(path, digest=False)
+    if (current["size"] == signature["size"] and
+            current["mtime_ns"] == signature["mtime_ns"]):
+        save_snapshot(snapshot, path, backend,
+                      dataset_state(dataset, backend), signature)
+    return dataset
+
+
+def iter_rows(dataset: Sequence[List], start: int = 0) -> Iterator[List]:
+    """
+    Yield the rows of a dataset from a position on.
+
+    Lists are walked in place; other backends are sliced CHUNK_SIZE rows
+    at a time, so memory stays bounded.
+    """
+    if isinstance(dataset, list):
+        yield from islice(dataset, start, None)
+        return
+    for chunk_start in range(start, len(dataset), CHUNK_SIZE):
+        yield from dataset[chunk_start:chunk_start + CHUNK_SIZE]
+
+
+def slice_ranges(dataset: Sequence[List],
+                 ranges: List[Tuple[int, int]]) -> List[List[List]]:
+    """
+    Slice several [start, end) ranges out of a dataset in one pass.
+
+    Overlapping or adjacent ranges are merged so each run of rows is
+    sliced (and, for the index backend, read and parsed) only once.
+
+    Args:
+        dataset (Sequence[List]): The rows.
+        ranges (List[Tuple[int, int]]): The ranges, in any order.
+
+    Returns:
+        List[List[List]]: The rows of each range, in request order.
+    """
+    results = [[] for _ in ranges]
+    order = sorted((r for r in range(len(ranges))
+                    if ranges[r][0] < ranges[r][1]), key=ranges.__getitem__)
+    span = []
+    span_start = span_end = 0
+    for r in order + [None]:
+        if r is not None and span and ranges[r][0] <= span_end:
+            span_end = max(span_end, ranges[r][1])
+            span.append(r)
+            continue
+        if span:
+            chunk = dataset[span_start:span_end]
+            for member in span:
+                start, end = ranges[member]
+                results[member] = chunk[start - span_start:end - span_start]
+        if r is not None:
+            span = [r]
+            span_start, span_end = ranges[r]
+    return results
+
+
+class SourceTracker:
+    """Remembers how much of a CSV file was loaded.
+
+    A few kilobytes at the start and at the end of the loaded region are
+    kept, so that growth of the file can be told apart from a rewrite.
+    A write that keeps the size of the file counts as a rewrite.
+    """
+
+    PROBE_SIZE = 4096
+
+    def __init__(self, path: str, loaded: int):
+        """
+        Args:
+            path (str): Path to the CSV file.
+            loaded (int): Number of bytes already loaded.
+        """
+        self.path = path
+        self.mark(loaded)
+
+    def _read(self, start: int, size: int) -> bytes:
+        """Read size bytes of the file from start."""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return f.read(size)
+
+    def mark(self, loaded: int):
+        """Record that the first loaded bytes of the file are loaded."""
+        self.loaded = loaded
+        self.mtime_ns = os.stat(self.path).st_mtime_ns
+        self.head = self._read(0, min(loaded, self.PROBE_SIZE))
+        tail = min(loaded, self.PROBE_SIZE)
+        self.tail = self._read(loaded - tail, tail)
+
+    def poll(self) -> str:
+        """
+        Compare the file against what was loaded.
+
+        Returns:
+            str: "unchanged", "appended", or "rewritten" when the loaded
+            bytes were truncated or modified.
+        """
+        st = os.stat(self.path)
+        if st.st_size == self.loaded and st.st_mtime_ns == self.mtime_ns:
+            return "unchanged"
+        if st.st_size <= self.loaded:
+            # Same size but written to: any loaded byte may have changed
+            return "rewritten"
+        if (self._read(0, len(self.head)) != self.head or
+                self._read(self.loaded - len(self.tail),
+                           len(self.tail)) != self.tail):
+            return "rewritten"
+        return "appended"
+
+
+def load_tracked(path: str, backend: str = "list",
+                 snapshot: Optional[str] = None,
+                 workers: int = 1) -> Tuple[Sequence[List], SourceTracker]:
+    """
+    Load a dataset like load_dataset, along with a tracker of the bytes
+    it was built from. The load is retried if the file changes meanwhile.
+    """
+    while True:
+        size = os.path.getsize(path)
+        dataset = load_dataset(path, backend, snapshot, workers)
+        if os.path.getsize(path) == size:
+            return dataset, SourceTracker(path, size)
+
+
+def read_appended(path: str, start: int) -> Tuple[List[int], List[List]]:
+    """
+    Parse the complete records written after a byte offset.
+
+    A trailing record without its final newline is left for later, as
+    it may still be being written.
+
+    Args:
+        path (str): Path to the CSV file.
+        start (int): Offset where the new records begin.
+
+    Returns:
+        Tuple[List[int], List[List]]: The start offset of every new
+        record plus the end offset, and the parsed rows.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read()
+    offsets = [start]
+    position = start
+    in_quotes = False
+    for line in io.BytesIO(data):
+        position += len(line)
+        if line.count(b'"') & 1:
+            in_quotes = not in_quotes
+        if not in_quotes and line.endswith(b"\n"):
+            offsets.append(position)
+    if len(offsets) == 1:
+        return offsets, []
+    return offsets, parse_range(path, start, offsets[-1])
+
+
+def extend_dataset(dataset: Sequence[List], backend: str,
+                   offsets: List[int], rows: List[List]):
+    """Append rows returned by read_appended to a loaded dataset."""
+    if backend == "index":
+        dataset.extend(offsets)
+    else:
+        dataset.extend(rows)
+
+
+class DatasetLoader:
+    """Dataset of a CSV file, loaded on first use and kept up to date.
+
+    The first caller of dataset() loads it while concurrent callers
+    wait for it. refresh() then adds the rows appended to the file, or
+    reloads it after a rewrite. The lock is reentrant, so the Server
+    owning the loader can update its own indexes under it too.
+    """
+
+    def __init__(self, path: str, backend: str = "list",
+                 snapshot: Optional[str] = None, workers: int = 1):
+        """
+        Args:
+            path (str): Path to the CSV file.
+            backend (str): One of BACKENDS.
+            snapshot (str): Optional path of a binary snapshot of the
+                parsed dataset, reused while the file is unchanged.
+            workers (int): Processes parsing the CSV in parallel chunks.
+        """
+        assert backend in BACKENDS, "Unknown backend."
+        self.path = path
+        self.backend = backend
+        self.snapshot = snapshot
+        self.workers = workers
+        self.lock = threading.RLock()
+        self.tracker = None
+        self._dataset = None
+        # Seconds spent loading the dataset, None until it is loaded
+        self.load_duration = None
+
+    def dataset(self) -> Sequence[List]:
+        """Return the dataset, loading it on first use."""
+        # Read once: refresh() may swap in another dataset meanwhile
+        dataset = self._dataset
+        if dataset is None:
+            with self.lock:
+                # Only the first caller loads; concurrent ones wait for it
+                if self._dataset is None:
+                    self._load()
+                dataset = self._dataset
+        return dataset
+
+    def _load(self):
+        """Load the dataset, then swap it in with one assignment."""
+        started = time.perf_counter()
+        dataset, self.tracker = load_tracked(
+            self.path, self.backend, self.snapshot, self.workers)
+        self.load_duration = time.perf_counter() - started
+        self._dataset = dataset
+
+    def refresh(self) -> Tuple[str, int, List[List]]:
+        """
+        Pick up changes made to the file since it was loaded.
+
+        Rows appended to the file are parsed and added in place; a
+        truncated or rewritten file is reloaded from scratch.
+
+        Returns:
+            Tuple[str, int, List[List]]: What the tracker saw
+            ("unchanged" as well when nothing is loaded yet), then for
+            "appended" the position of the first new row and the new
+            rows.
+        """
+        with self.lock:
+            if self._dataset is None:
+                return "unchanged", 0, []
+            change = self.tracker.poll()
+            if change == "rewritten":
+                # Readers keep the old dataset until the new one is ready
+                self._load()
+            if change != "appended":
+                return change, 0, []
+            offsets, rows = read_appended(self.path, self.tracker.loaded)
+            start = len(self._dataset)
+            extend_dataset(self._dataset, self.backend, offsets, rows)
+            self.tracker.mark(offsets[-1])
+            return change, start, rows
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests of the cursor module.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from cursor import SortedIndex, decode_cursor, encode_cursor  # noqa: E402
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Sort keys and the sorted index"""
+
+    def test_numbers_sort_numerically(self):
+        """Integer strings sort by value, before any other string"""
+        rows = enumerate([["10"], ["b"], ["9"], ["a"]])
+        index = SortedIndex(rows, (0,))
+        self.assertEqual([position for _, position in index.entries],
+                         [2, 0, 3, 1])
+
+    def test_unicode_digits_are_strings(self):
+        """Digits int() rejects, such as superscripts, sort as text"""
+        rows = enumerate([["²"], ["3"], ["٣"]])
+        index = SortedIndex(rows, (0,))
+        self.assertEqual([position for _, position in index.entries],
+                         [1, 0, 2])
+
+    def test_extend_merges(self):
+        """Added rows are merged in key order"""
+        index = SortedIndex(enumerate([["1"], ["5"]]), (0,))
+        index.extend([(2, ["3"]), (3, ["7"]), (4, ["0"])])
+        self.assertEqual([position for _, position in index.entries],
+                         [4, 0, 2, 1, 3])
+
+
+class TestCursor(unittest.TestCase):
+    """Signed cursors"""
+
+    def test_round_trip(self):
+        """A cursor decodes to its payload with the same secret"""
+        token = encode_cursor({"d": "next", "k": [[], 3]}, b"key")
+        self.assertEqual(decode_cursor(token, b"key"),
+                         {"d": "next", "k": [[], 3]})
+        with self.assertRaises(ValueError):
+            decode_cursor(token, b"other")
+
+
+if __name__ == "__main__":
+    unittest.main()
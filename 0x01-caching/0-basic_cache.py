@@ -1,26 +1,35 @@
 #!/usr/bin/python3
 """ BasicCache module """
 from base_caching import BaseCaching
+from bulk import BulkMixin
+from expiry import TTLMixin
 
 
-class BasicCache(BaseCaching):
+class BasicCache(TTLMixin, BulkMixin, BaseCaching):
     """
     BasicCache class that inherits from BaseCaching.
     This caching system has no limit on the number of items stored.
     """
 
-    def put(self, key, item):
+    def _remove(self, key):
+        """Remove a key from the cache."""
+        del self.cache_data[key]
+
+    def put(self, key, item, ttl=None):
         """
         Add an item in the cache.
 
         Args:
             key: The key under which to store the item.
             item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
 
         If either key or item is None, this method does nothing.
         """
         if key is not None and item is not None:
+            self._expire_due(key)
             self.cache_data[key] = item
+            self._set_ttl(key, ttl)
 
     def get(self, key):
         """
@@ -30,7 +39,48 @@ class BasicCache(BaseCaching):
             key: The key of the item to retrieve.
 
         Returns:
-            The value associated with the key, or None if the key is None
-            or does not exist in the cache.
+            The value associated with the key, or None if the key is None,
+            does not exist in the cache or has expired.
+        """
+        self._expire_due(key)
+        item = self.cache_data.get(key, None)
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+    def get_many(self, keys):
+        """
+        Get several items by key, in one pass when none can expire.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            A dictionary of the keys found in the cache and their items.
+        """
+        if self.deadlines:
+            return super().get_many(keys)
+        return self._get_many(keys)
+
+    def put_many(self, items, ttl=None):
+        """
+        Add several items in the cache.
+
+        Args:
+            items: A mapping, or an iterable of (key, item) pairs.
+            ttl: Seconds until the items expire, or None to keep them.
+
+        Pairs whose key or item is None are skipped, as with put().
         """
-        return self.cache_data.get(key, None)
+        if self.deadlines:
+            super().put_many(items, ttl)
+            return
+        data = self.cache_data
+        pairs = items.items() if hasattr(items, "items") else items
+        for key, item in pairs:
+            if key is not None and item is not None:
+                data[key] = item
+                if ttl is not None:
+                    self._set_ttl(key, ttl)
@@ -1,43 +1,76 @@
 #!/usr/bin/python3
 """ FIFOCache module """
+from collections import OrderedDict
 
 from base_caching import BaseCaching
+from bulk import BulkMixin
+from events import EVICTED
+from expiry import TTLMixin
+from weight import WeightMixin
 
 
-class FIFOCache(BaseCaching):
+class FIFOCache(TTLMixin, WeightMixin, BulkMixin, BaseCaching):
     """
     FIFOCache class that inherits from BaseCaching.
     Implements a caching system with
     a FIFO (First-In-First-Out) eviction policy.
+
+    cache_data is an OrderedDict kept in insertion order, so adding,
+    updating and evicting an item are all O(1).
     """
 
-    def __init__(self):
-        """Initialize the cache"""
+    def __init__(self, max_items=None, max_weight=None, weigher=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Capacity of this cache, BaseCaching.MAX_ITEMS
+                by default (no limit when max_weight is given).
+            max_weight: Maximum total weight of the items, or None.
+            weigher: Function returning the weight of an item; the
+                default is its deep sys.getsizeof().
+        """
         super().__init__()
-        self.order = []
+        self._set_limits(max_items, max_weight, weigher)
+        self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def _remove(self, key):
+        """Remove a key from the cache."""
+        del self.cache_data[key]
+
+    def _victims(self):
+        """Yield keys from the oldest to the newest."""
+        return iter(self.cache_data)
+
+    def put(self, key, item, ttl=None):
         """
         Add an item in the cache.
 
         Args:
             key: The key under which to store the item.
             item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
 
         If either key or item is None, this method does nothing.
-        If the cache exceeds its MAX_ITEMS,
+        If the cache exceeds its max_items,
         it discards the oldest item in the cache.
+        An item heavier than max_weight is not cached.
         """
         if key is not None and item is not None:
-            if key in self.cache_data:
-                self.order.remove(key)
+            self._expire_due(key)
+            weight = self._weigh(key, item)
+            if weight is None:
+                return
             self.cache_data[key] = item
-            self.order.append(key)
+            # An updated item counts as newly inserted
+            self.cache_data.move_to_end(key)
+            self._set_ttl(key, ttl)
 
-            if len(self.cache_data) > BaseCaching.MAX_ITEMS:
-                first_key = self.order.pop(0)
-                del self.cache_data[first_key]
-                print(f"DISCARD: {first_key}")
+            if len(self.cache_data) > self.max_items:
+                first_key, first_item = self.cache_data.popitem(last=False)
+                self._forget(first_key)
+                self._notify(EVICTED, first_key, first_item)
+            self._charge(key, weight)
 
     def get(self, key):
         """
@@ -49,6 +82,64 @@ class FIFOCache(BaseCaching):
         Returns:
             The value associated with the key,
             or None if the key is None
-            or does not exist in the cache.
+            or does not exist in the cache
+            or has expired.
+        """
+        self._expire_due(key)
+        item = self.cache_data.get(key, None)
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+    def get_many(self, keys):
+        """
+        Get several items by key, in one pass when none can expire.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            A dictionary of the keys found in the cache and their items.
+        """
+        if self.deadlines:
+            return super().get_many(keys)
+        return self._get_many(keys)
+
+    def put_many(self, items, ttl=None):
+        """
+        Add several items in the cache, as put() would one at a time.
+
+        Args:
+            items: A mapping, or an iterable of (key, item) pairs.
+            ttl: Seconds until the items expire, or None to keep them.
+
+        When every key of the batch is new, or nothing has to be
+        discarded, all the items are stored first, then the oldest
+        items are discarded in a single round. Otherwise a key could be
+        discarded and put again within the batch, so the items are put
+        one at a time, as they also are with TTLs pending or a weight
+        budget.
         """
-        return self.cache_data.get(key, None)
+        pairs = [(key, item) for key, item in
+                 (items.items() if hasattr(items, "items") else items)
+                 if key is not None and item is not None]
+        data = self.cache_data
+        new = {key for key, _ in pairs if key not in data}
+        if (self.deadlines or self.max_weight is not None or
+                (len(new) < len(pairs) and
+                 len(data) + len(new) > self.max_items)):
+            super().put_many(pairs, ttl)
+            return
+        for key, item in pairs:
+            data[key] = item
+            data.move_to_end(key)
+        while len(data) > self.max_items:
+            first_key, first_item = data.popitem(last=False)
+            self._forget(first_key)
+            self._notify(EVICTED, first_key, first_item)
+        if ttl is not None:
+            for key, _ in pairs:
+                if key in data:
+                    self._set_ttl(key, ttl)
@@ -1,67 +1,160 @@
 #!/usr/bin/python3
 """ LFUCache module """
+from collections import OrderedDict
+from heapq import merge
+from itertools import count
 
 from base_caching import BaseCaching
+from bulk import BulkMixin
+from events import EVICTED
+from expiry import TTLMixin
+from weight import WeightMixin
 
 
-class LFUCache(BaseCaching):
+class LFUCache(TTLMixin, WeightMixin, BulkMixin, BaseCaching):
     """
     LFUCache class that inherits from BaseCaching.
     Implements a caching system with an LFU (Least Frequently Used)
     eviction policy.
+
+    Keys are grouped in one bucket per use count; each bucket is an
+    OrderedDict from least to most recently used, and min_frequency
+    points at the lowest non-empty bucket, so get, put and evict are
+    O(1). Frequencies can optionally be aged, so keys that were hot a
+    long time ago do not stay in the cache forever.
     """
 
-    def __init__(self):
-        """Initialize the cache"""
+    def __init__(self, max_items=None, decay_interval=None,
+                 max_weight=None, weigher=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Capacity of this cache, BaseCaching.MAX_ITEMS
+                by default (no limit when max_weight is given).
+            max_weight: Maximum total weight of the items, or None.
+            weigher: Function returning the weight of an item; the
+                default is its deep sys.getsizeof().
+            decay_interval: If set, halve every frequency after this
+                many accesses (gets and puts). Aging is O(n) but runs
+                once per interval, so an interval of at least max_items
+                keeps operations amortized O(1).
+        """
         super().__init__()
+        self._set_limits(max_items, max_weight, weigher)
+        assert decay_interval is None or decay_interval > 0, \
+            "Decay interval must be positive."
+        self.decay_interval = decay_interval
         self.frequency = {}  # To keep track of the frequency of each key
         self.usage_order = {}  # To keep track of the order of usage
+        self.buckets = {}  # Keys by frequency, least recent first
+        self.min_frequency = 0
+        self.accesses = 0
+        self._clock = count()
+
+    def _touch(self, key):
+        """Count one more use of a key already in the cache."""
+        freq = self.frequency[key]
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_frequency == freq:
+                self.min_frequency = freq + 1
+        self.frequency[key] = freq + 1
+        self.buckets.setdefault(freq + 1, OrderedDict())[key] = None
+        self.usage_order[key] = next(self._clock)
+
+    def _evict(self):
+        """Discard the least recently used of the least used keys."""
+        bucket = self.buckets[self.min_frequency]
+        oldest_key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self.buckets[self.min_frequency]
+        oldest_item = self.cache_data.pop(oldest_key)
+        del self.frequency[oldest_key]
+        del self.usage_order[oldest_key]
+        self._forget(oldest_key)
+        self._notify(EVICTED, oldest_key, oldest_item)
+
+    def _remove(self, key):
+        """Remove a key from the cache and its frequency bucket."""
+        freq = self.frequency.pop(key)
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_frequency == freq:
+                self.min_frequency = min(self.buckets, default=0)
+        del self.cache_data[key]
+        del self.usage_order[key]
+
+    def _victims(self):
+        """Yield keys by frequency, least recently used first."""
+        yield from self.buckets.get(self.min_frequency, ())
+        for freq in sorted(self.buckets):
+            if freq != self.min_frequency:
+                yield from self.buckets[freq]
+
+    def _access(self):
+        """Count an access, aging the frequencies once per interval."""
+        self.accesses += 1
+        if self.decay_interval and self.accesses % self.decay_interval == 0:
+            self.decay()
 
-    def put(self, key, item):
+    def decay(self):
+        """
+        Halve every frequency (keeping it at least 1).
+
+        Buckets merging into the same frequency are merged by usage
+        order, so ties are still broken by least recent use.
+        """
+        merged = {}
+        for freq, bucket in self.buckets.items():
+            merged.setdefault(max(1, freq // 2), []).append(bucket)
+        self.buckets = {}
+        for freq, buckets in merged.items():
+            keys = merge(*buckets, key=self.usage_order.__getitem__)
+            self.buckets[freq] = OrderedDict.fromkeys(keys)
+            for key in self.buckets[freq]:
+                self.frequency[key] = freq
+        self.min_frequency = min(self.buckets, default=0)
+
+    def put(self, key, item, ttl=None):
         """
         Add an item in the cache.
 
         Args:
             key: The key under which to store the item.
             item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
 
         If either key or item is None, this method does nothing.
-        If the cache exceeds its MAX_ITEMS, it discards the least frequently
+        If the cache exceeds its max_items, it discards the least frequently
         used item. In case of a tie in frequency, it uses the LRU (Least
         Recently Used) policy.
+        An item heavier than max_weight is not cached.
         """
         if key is not None and item is not None:
-            if (len(self.cache_data) >= BaseCaching.MAX_ITEMS and
-                    key not in self.cache_data):
-                # Find the least frequently used keys
-                min_freq = min(self.frequency.values())
-                least_freq_keys = [
-                    k for k, v in self.frequency.items() if v == min_freq]
-
-                # Resolve ties by least recently used policy
-                if len(least_freq_keys) > 1:
-                    oldest_key = min(
-                        least_freq_keys, key=lambda k: self.usage_order[k])
-                else:
-                    oldest_key = least_freq_keys[0]
-
-                # Evict the chosen key
-                del self.cache_data[oldest_key]
-                del self.frequency[oldest_key]
-                del self.usage_order[oldest_key]
-                print(f"DISCARD: {oldest_key}")
-
-            # Add/Update the cache data
-            self.cache_data[key] = item
-
-            # Update frequency and usage order
-            if key in self.frequency:
-                self.frequency[key] += 1
+            self._expire_due(key)
+            weight = self._weigh(key, item)
+            if weight is None:
+                return
+            if key in self.cache_data:
+                self._touch(key)
             else:
+                if self.cache_data and len(self.cache_data) >= self.max_items:
+                    self._evict()
                 self.frequency[key] = 1
+                self.buckets.setdefault(1, OrderedDict())[key] = None
+                self.usage_order[key] = next(self._clock)
+                self.min_frequency = 1
 
-            # Update the usage order to reflect the most recent use
-            self.usage_order[key] = len(self.usage_order)
+            # Add/Update the cache data
+            self.cache_data[key] = item
+            self._set_ttl(key, ttl)
+            self._charge(key, weight)
+            self._access()
 
     def get(self, key):
         """
@@ -71,13 +164,15 @@ class LFUCache(BaseCaching):
             key: The key of the item to retrieve.
 
         Returns:
-            The value associated with the key, or None if the key is None
-            or does not exist in the cache.
+            The value associated with the key, or None if the key is None,
+            does not exist in the cache or has expired.
         """
+        self._expire_due(key)
         if key is not None and key in self.cache_data:
             # Increase the frequency since the key is being accessed
-            self.frequency[key] += 1
-            # Update the usage order to reflect the most recent access
-            self.usage_order[key] = len(self.usage_order)
-            return self.cache_data.get(key)
+            self._touch(key)
+            self._access()
+            self.hits += 1
+            return self.cache_data[key]
+        self.misses += 1
         return None
@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+""" ARCCache module """
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+from bulk import BulkMixin
+from events import EVICTED
+from expiry import TTLMixin
+from weight import WeightMixin
+
+
+class ARCCache(TTLMixin, WeightMixin, BulkMixin, BaseCaching):
+    """
+    ARCCache class that inherits from BaseCaching.
+    Implements a caching system with the ARC (Adaptive Replacement
+    Cache) eviction policy.
+
+    Cached keys are split between t1, seen once recently, and t2, seen
+    at least twice; b1 and b2 remember the keys recently evicted from
+    each (without their items). A put hitting b1 means t1 was too small
+    and grows its target size p; a put hitting b2 shrinks it. The cache
+    so tunes itself between recency and frequency, and a scan of new
+    keys only cycles through t1, leaving the frequent keys of t2 alone.
+    All four lists are OrderedDicts, from least to most recent, so get
+    and put are O(1).
+    """
+
+    def __init__(self, max_items=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Capacity of this cache, BaseCaching.MAX_ITEMS
+                by default. The ghost lists hold as many keys again.
+        """
+        super().__init__()
+        self._set_limits(max_items)
+        self.p = 0  # Target size of t1
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+
+    def _remove(self, key):
+        """Remove a key from the cache, without remembering it."""
+        del self.cache_data[key]
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+
+    def _replace(self, in_b2):
+        """Evict the LRU key of t1 or t2 into its ghost list."""
+        if self.t1 and (len(self.t1) > self.p or
+                        (in_b2 and len(self.t1) == self.p)):
+            old_key, _ = self.t1.popitem(last=False)
+            self.b1[old_key] = None
+        else:
+            old_key, _ = self.t2.popitem(last=False)
+            self.b2[old_key] = None
+        old_item = self.cache_data.pop(old_key)
+        self._forget(old_key)
+        self._notify(EVICTED, old_key, old_item)
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item in the cache.
+
+        Args:
+            key: The key under which to store the item.
+            item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
+
+        If either key or item is None, this method does nothing.
+        If the cache exceeds its max_items, it discards the least
+        recently used key of t1 or t2, as the adaptive target decides.
+        """
+        if key is not None and item is not None:
+            self._expire_due(key)
+            size = self.max_items
+            # Expired keys can leave the cache short of full
+            full = len(self.cache_data) >= size
+            if key in self.cache_data:
+                self.t1.pop(key, None)
+                self.t2.pop(key, None)
+                self.t2[key] = None
+            elif key in self.b1:
+                # Recency was evicted too early: favour t1
+                self.p = min(size, self.p + max(len(self.b2) //
+                                                len(self.b1), 1))
+                if full:
+                    self._replace(False)
+                del self.b1[key]
+                self.t2[key] = None
+            elif key in self.b2:
+                # Frequency was evicted too early: favour t2
+                self.p = max(0, self.p - max(len(self.b1) //
+                                             len(self.b2), 1))
+                if full:
+                    self._replace(True)
+                del self.b2[key]
+                self.t2[key] = None
+            else:
+                ghosts = len(self.b1) + len(self.b2)
+                if len(self.t1) + len(self.b1) >= size:
+                    if len(self.t1) < size:
+                        self.b1.popitem(last=False)
+                        if full:
+                            self._replace(False)
+                    else:
+                        old_key, _ = self.t1.popitem(last=False)
+                        old_item = self.cache_data.pop(old_key)
+                        self._forget(old_key)
+                        self._notify(EVICTED, old_key, old_item)
+                elif len(self.cache_data) + ghosts >= size:
+                    if len(self.cache_data) + ghosts >= 2 * size:
+                        self.b2.popitem(last=False)
+                    if full:
+                        self._replace(False)
+                self.t1[key] = None
+
+            self.cache_data[key] = item
+            self._set_ttl(key, ttl)
+
+    def get(self, key):
+        """
+        Get an item by key.
+
+        Args:
+            key: The key of the item to retrieve.
+
+        Returns:
+            The value associated with the key, or None if the key is None,
+            does not exist in the cache or has expired.
+        """
+        self._expire_due(key)
+        if key is not None and key in self.cache_data:
+            # A second use promotes the key to the frequent list
+            if key in self.t1:
+                del self.t1[key]
+            else:
+                del self.t2[key]
+            self.t2[key] = None
+            self.hits += 1
+            return self.cache_data[key]
+        self.misses += 1
+        return None
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+""" WTinyLFUCache module """
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+from bulk import BulkMixin
+from events import EVICTED
+from expiry import TTLMixin
+from sketch import CountMinSketch
+from weight import WeightMixin
+
+
+class WTinyLFUCache(TTLMixin, WeightMixin, BulkMixin, BaseCaching):
+    """
+    WTinyLFUCache class that inherits from BaseCaching.
+    Implements a caching system with the W-TinyLFU eviction policy.
+
+    New keys enter a small LRU window. A key pushed out of the window
+    is a candidate for the main cache, a segmented LRU of a probation
+    and a protected part: it is admitted only if a count-min sketch of
+    recent accesses estimates it more popular than the key it would
+    evict from probation. One-off keys, such as those of a scan, so
+    leave through the window without displacing the working set. Every
+    part is an OrderedDict from least to most recent, so get and put
+    are O(1).
+    """
+    WINDOW_SHARE = 0.01  # Part of the capacity given to the window
+    PROTECTED_SHARE = 0.8  # Part of the main cache that is protected
+
+    def __init__(self, max_items=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Capacity of this cache, BaseCaching.MAX_ITEMS
+                by default.
+        """
+        super().__init__()
+        self._set_limits(max_items)
+        self.window_size = max(1, int(self.max_items * self.WINDOW_SHARE))
+        self.main_size = max(0, self.max_items - self.window_size)
+        self.protected_size = max(1, int(self.main_size *
+                                         self.PROTECTED_SHARE))
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(self.max_items)
+
+    def _segment(self, key):
+        """Return the part of the cache holding a key."""
+        if key in self.window:
+            return self.window
+        if key in self.probation:
+            return self.probation
+        return self.protected
+
+    def _remove(self, key):
+        """Remove a key from the cache."""
+        del self._segment(key)[key]
+        del self.cache_data[key]
+
+    def _discard(self, key):
+        """Evict a key that left the window or probation."""
+        item = self.cache_data.pop(key)
+        self._forget(key)
+        self._notify(EVICTED, key, item)
+
+    def _hit(self, key):
+        """Move a cached key up after an access."""
+        segment = self._segment(key)
+        if segment is self.probation:
+            del self.probation[key]
+            self.protected[key] = None
+            if len(self.protected) > self.protected_size:
+                # Demote the least recent protected key
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+        else:
+            segment.move_to_end(key)
+
+    def _admit(self):
+        """Move the window's oldest key to the main cache, or evict it."""
+        candidate, _ = self.window.popitem(last=False)
+        if len(self.probation) + len(self.protected) < self.main_size:
+            self.probation[candidate] = None
+            return
+        main = self.probation or self.protected
+        victim = next(iter(main), None)
+        if victim is not None and (self.sketch.frequency(candidate) >
+                                   self.sketch.frequency(victim)):
+            del main[victim]
+            self.probation[candidate] = None
+            self._discard(victim)
+        else:
+            self._discard(candidate)
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item in the cache.
+
+        Args:
+            key: The key under which to store the item.
+            item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
+
+        If either key or item is None, this method does nothing.
+        If the cache exceeds its max_items, either the key leaving the
+        window or the least recent key on probation is discarded,
+        whichever the sketch finds less popular.
+        """
+        if key is not None and item is not None:
+            self._expire_due(key)
+            self.sketch.increment(key)
+            if key in self.cache_data:
+                self._hit(key)
+            else:
+                self.window[key] = None
+                if len(self.window) > self.window_size:
+                    self._admit()
+            self.cache_data[key] = item
+            self._set_ttl(key, ttl)
+
+    def get(self, key):
+        """
+        Get an item by key.
+
+        Args:
+            key: The key of the item to retrieve.
+
+        Returns:
+            The value associated with the key, or None if the key is None,
+            does not exist in the cache or has expired.
+        """
+        self._expire_due(key)
+        if key is None:
+            self.misses += 1
+            return None
+        self.sketch.increment(key)
+        if key in self.cache_data:
+            self._hit(key)
+            self.hits += 1
+            return self.cache_data[key]
+        self.misses += 1
+        return None
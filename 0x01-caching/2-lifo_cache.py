@@ -1,47 +1,78 @@
 #!/usr/bin/python3
 """ LIFOCache module """
+from collections import OrderedDict
 
 from base_caching import BaseCaching
+from bulk import BulkMixin
+from events import EVICTED
+from expiry import TTLMixin
+from weight import WeightMixin
 
 
-class LIFOCache(BaseCaching):
+class LIFOCache(TTLMixin, WeightMixin, BulkMixin, BaseCaching):
     """
     LIFOCache class that inherits from BaseCaching.
     Implements a caching system with a LIFO
     (Last-In-First-Out) eviction policy.
+
+    cache_data is an OrderedDict used as the stack, so adding, updating
+    and evicting an item are all O(1).
     """
 
-    def __init__(self):
-        """Initialize the cache"""
+    def __init__(self, max_items=None, max_weight=None, weigher=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Capacity of this cache, BaseCaching.MAX_ITEMS
+                by default (no limit when max_weight is given).
+            max_weight: Maximum total weight of the items, or None.
+            weigher: Function returning the weight of an item; the
+                default is its deep sys.getsizeof().
+        """
         super().__init__()
-        self.stack = []
+        self._set_limits(max_items, max_weight, weigher)
+        self.cache_data = OrderedDict()
+
+    def _remove(self, key):
+        """Remove a key from the cache."""
+        del self.cache_data[key]
 
-    def put(self, key, item):
+    def _victims(self):
+        """Yield keys from the top of the stack down."""
+        return reversed(self.cache_data)
+
+    def put(self, key, item, ttl=None):
         """
         Add an item in the cache.
 
         Args:
             key: The key under which to store the item.
             item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
 
         If either key or item is None,
         this method does nothing.
-        If the cache exceeds its MAX_ITEMS,
+        If the cache exceeds its max_items,
         it discards the last item added to the cache.
+        An item heavier than max_weight is not cached.
         """
         if key is not None and item is not None:
-            if key in self.cache_data:
-                # Remove the key from the stack if it
-                # already exists (to update its position)
-                self.stack.remove(key)
+            self._expire_due(key)
+            weight = self._weigh(key, item)
+            if weight is None:
+                return
+            if (key not in self.cache_data and self.cache_data and
+                    len(self.cache_data) >= self.max_items):
+                # Evict the top of the stack before pushing the new key
+                last_key, last_item = self.cache_data.popitem(last=True)
+                self._forget(last_key)
+                self._notify(EVICTED, last_key, last_item)
             self.cache_data[key] = item
-            self.stack.append(key)
-
-            if len(self.cache_data) > BaseCaching.MAX_ITEMS:
-                # Evict the last item in the stack (LIFO)
-                last_key = self.stack.pop(-2)
-                del self.cache_data[last_key]
-                print(f"DISCARD: {last_key}")
+            # An updated item moves to the top of the stack
+            self.cache_data.move_to_end(key)
+            self._set_ttl(key, ttl)
+            self._charge(key, weight)
 
     def get(self, key):
         """
@@ -53,6 +84,27 @@ class LIFOCache(BaseCaching):
         Returns:
             The value associated with the key,
             or None if the key is None
-            or does not exist in the cache.
+            or does not exist in the cache
+            or has expired.
+        """
+        self._expire_due(key)
+        item = self.cache_data.get(key, None)
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+    def get_many(self, keys):
+        """
+        Get several items by key, in one pass when none can expire.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            A dictionary of the keys found in the cache and their items.
         """
-        return self.cache_data.get(key, None)
+        if self.deadlines:
+            return super().get_many(keys)
+        return self._get_many(keys)
@@ -1,48 +1,79 @@
 #!/usr/bin/python3
 """ LRUCache module """
+from collections import OrderedDict
+
 from base_caching import BaseCaching
+from bulk import BulkMixin
+from events import EVICTED
+from expiry import TTLMixin
+from weight import WeightMixin
 
 
-class LRUCache(BaseCaching):
+class LRUCache(TTLMixin, WeightMixin, BulkMixin, BaseCaching):
     """
     LRUCache class that inherits from BaseCaching.
     Implements a caching system with an LRU
     (Least Recently Used) eviction policy.
+
+    cache_data is an OrderedDict (a hash map threaded by a doubly linked
+    list) ordered from least to most recently used, so get and put are
+    O(1).
     """
 
-    def __init__(self):
-        """Initialize the cache"""
+    def __init__(self, max_items=None, max_weight=None, weigher=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Capacity of this cache, BaseCaching.MAX_ITEMS
+                by default (no limit when max_weight is given).
+            max_weight: Maximum total weight of the items, or None.
+            weigher: Function returning the weight of an item; the
+                default is its deep sys.getsizeof().
+        """
         super().__init__()
-        # List to track the access order of the keys
-        self.access_order = []
+        self._set_limits(max_items, max_weight, weigher)
+        self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def _remove(self, key):
+        """Remove a key from the cache."""
+        del self.cache_data[key]
+
+    def _victims(self):
+        """Yield keys from the least to the most recently used."""
+        return iter(self.cache_data)
+
+    def put(self, key, item, ttl=None):
         """
         Add an item in the cache.
 
         Args:
             key: The key under which to store the item.
             item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
 
         If either key or item is None, this method does nothing.
-        If the cache exceeds its MAX_ITEMS,
+        If the cache exceeds its max_items,
         it discards the least recently used item.
+        An item heavier than max_weight is not cached.
         """
         if key is not None and item is not None:
+            self._expire_due(key)
+            weight = self._weigh(key, item)
+            if weight is None:
+                return
             if key in self.cache_data:
-                # Remove the key from the access order list to update its
-                # position
-                self.access_order.remove(key)
-            elif len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                # Evict the least recently used item (the first item in the
-                # list)
-                lru_key = self.access_order.pop(0)
-                del self.cache_data[lru_key]
-                print(f"DISCARD: {lru_key}")
-
-            # Add or update the key in the cache and the access order list
+                # Move the key to the most recently used end
+                self.cache_data.move_to_end(key)
+            elif self.cache_data and len(self.cache_data) >= self.max_items:
+                # Evict the least recently used item (the first one)
+                lru_key, lru_item = self.cache_data.popitem(last=False)
+                self._forget(lru_key)
+                self._notify(EVICTED, lru_key, lru_item)
+
             self.cache_data[key] = item
-            self.access_order.append(key)
+            self._set_ttl(key, ttl)
+            self._charge(key, weight)
 
     def get(self, key):
         """
@@ -52,12 +83,65 @@ class LRUCache(BaseCaching):
             key: The key of the item to retrieve.
 
         Returns:
-            The value associated with the key, or None if the key is None
-            or does not exist in the cache.
+            The value associated with the key, or None if the key is None,
+            does not exist in the cache or has expired.
         """
+        self._expire_due(key)
         if key is not None and key in self.cache_data:
             # Update the access order because this key was recently accessed
-            self.access_order.remove(key)
-            self.access_order.append(key)
-            return self.cache_data.get(key)
+            self.cache_data.move_to_end(key)
+            self.hits += 1
+            return self.cache_data[key]
+        self.misses += 1
         return None
+
+    def get_many(self, keys):
+        """
+        Get several items by key, in one pass when none can expire.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            A dictionary of the keys found in the cache and their items.
+        """
+        if self.deadlines:
+            return super().get_many(keys)
+        return self._get_many(keys, self.cache_data.move_to_end)
+
+    def put_many(self, items, ttl=None):
+        """
+        Add several items in the cache, as put() would one at a time.
+
+        Args:
+            items: A mapping, or an iterable of (key, item) pairs.
+            ttl: Seconds until the items expire, or None to keep them.
+
+        When every key of the batch is new, or nothing has to be
+        discarded, all the items are stored first, then the least recently used
+        items are discarded in a single round. Otherwise a key could be
+        discarded and put again within the batch, so the items are put
+        one at a time, as they also are with TTLs pending or a weight
+        budget.
+        """
+        pairs = [(key, item) for key, item in
+                 (items.items() if hasattr(items, "items") else items)
+                 if key is not None and item is not None]
+        data = self.cache_data
+        new = {key for key, _ in pairs if key not in data}
+        if (self.deadlines or self.max_weight is not None or
+                (len(new) < len(pairs) and
+                 len(data) + len(new) > self.max_items)):
+            super().put_many(pairs, ttl)
+            return
+        for key, item in pairs:
+            data[key] = item
+            data.move_to_end(key)
+        while len(data) > self.max_items:
+            first_key, first_item = data.popitem(last=False)
+            self._forget(first_key)
+            self._notify(EVICTED, first_key, first_item)
+        if ttl is not None:
+            for key, _ in pairs:
+                if key in data:
+                    self._set_ttl(key, ttl)
@@ -1,49 +1,91 @@
 #!/usr/bin/python3
 """ MRUCache module """
+from collections import OrderedDict
+
 from base_caching import BaseCaching
+from bulk import BulkMixin
+from events import EVICTED
+from expiry import TTLMixin
+from weight import WeightMixin
 
 
-class MRUCache(BaseCaching):
+class MRUCache(TTLMixin, WeightMixin, BulkMixin, BaseCaching):
     """
     MRUCache class that inherits from BaseCaching.
     Implements a caching system with an MRU
     (Most Recently Used) eviction policy.
+
+    cache_data is an OrderedDict from least to most recently used, so
+    when a weight budget calls for several evictions, the most recently
+    used items go first.
     """
 
-    def __init__(self):
-        """Initialize the cache"""
+    def __init__(self, max_items=None, max_weight=None, weigher=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Capacity of this cache, BaseCaching.MAX_ITEMS
+                by default (no limit when max_weight is given).
+            max_weight: Maximum total weight of the items, or None.
+            weigher: Function returning the weight of an item; the
+                default is its deep sys.getsizeof().
+        """
         super().__init__()
+        self._set_limits(max_items, max_weight, weigher)
+        self.cache_data = OrderedDict()
         # To keep track of the most recently used key
         self.most_recent_key = None
 
-    def put(self, key, item):
+    def _remove(self, key):
+        """Remove a key from the cache."""
+        del self.cache_data[key]
+        if self.most_recent_key == key:
+            self.most_recent_key = None
+
+    def _victims(self):
+        """Yield keys from the most to the least recently used."""
+        return reversed(self.cache_data)
+
+    def put(self, key, item, ttl=None):
         """
         Add an item in the cache.
 
         Args:
             key: The key under which to store the item.
             item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
 
         If either key or item is None, this method does nothing.
-        If the cache exceeds its MAX_ITEMS,
+        If the cache exceeds its max_items,
         it discards the most recently used item.
+        An item heavier than max_weight is not cached.
         """
         if key is not None and item is not None:
+            self._expire_due(key)
+            weight = self._weigh(key, item)
+            if weight is None:
+                return
             if key in self.cache_data:
                 # Just update the value; the key remains the most recent
                 self.cache_data[key] = item
             else:
-                if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
+                if len(self.cache_data) >= self.max_items:
                     # Evict the most recently used item
                     if self.most_recent_key is not None:
-                        del self.cache_data[self.most_recent_key]
-                        print(f"DISCARD: {self.most_recent_key}")
+                        mru_key = self.most_recent_key
+                        mru_item = self.cache_data.pop(mru_key)
+                        self._forget(mru_key)
+                        self._notify(EVICTED, mru_key, mru_item)
 
                 # Add the new key-value pair to the cache
                 self.cache_data[key] = item
 
+            self.cache_data.move_to_end(key)
+            self._set_ttl(key, ttl)
             # Update the most recent key
             self.most_recent_key = key
+            self._charge(key, weight)
 
     def get(self, key):
         """
@@ -53,11 +95,33 @@ class MRUCache(BaseCaching):
             key: The key of the item to retrieve.
 
         Returns:
-            The value associated with the key, or None if the key is None
-            or does not exist in the cache.
+            The value associated with the key, or None if the key is None,
+            does not exist in the cache or has expired.
         """
+        self._expire_due(key)
         if key is not None and key in self.cache_data:
             # Update the most recent key because this key was just accessed
             self.most_recent_key = key
+            self.cache_data.move_to_end(key)
+            self.hits += 1
             return self.cache_data.get(key)
+        self.misses += 1
         return None
+
+    def get_many(self, keys):
+        """
+        Get several items by key, in one pass when none can expire.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            A dictionary of the keys found in the cache and their items.
+        """
+        if self.deadlines:
+            return super().get_many(keys)
+        found = self._get_many(keys, self.cache_data.move_to_end)
+        if found:
+            # The last key found was moved to the most recent end
+            self.most_recent_key = next(reversed(self.cache_data))
+        return found
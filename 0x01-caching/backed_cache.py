@@ -0,0 +1,333 @@
+#!/usr/bin/python3
+""" BackedCache module """
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from base_caching import BaseCaching
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+DELETED = object()  # Buffered deletion of a key
+MAX_BACKOFF = 32  # Longest wait after failed flushes, in flush intervals
+
+
+class BackedCache(BaseCaching):
+    """
+    BackedCache class that inherits from BaseCaching.
+    A read-through, write-behind cache in front of a Store.
+
+    A miss loads the key from the store on a bounded pool of loader
+    threads; concurrent misses of the same key share one load. Writes
+    update the cache at once and are buffered, then a background thread
+    writes the buffer to the store in one batch every flush_interval
+    seconds, or as soon as it holds flush_size keys. Until flushed,
+    buffered writes are served from the buffer even once evicted; call
+    close(), or use a with statement, to flush the last ones.
+    """
+
+    def __init__(self, store, policy=LRUCache, max_items=None, loaders=4,
+                 flush_interval=1.0, flush_size=100, **options):
+        """
+        Initialize the cache and start its flushing thread
+
+        Args:
+            store: The Store the items are loaded from and written to.
+            policy: Cache class; it must accept a max_items keyword.
+            max_items: Capacity of the cache, the policy's default if
+                None.
+            loaders: Maximum number of loads running at once.
+            flush_interval: Seconds between two flushes of the writes.
+            flush_size: Number of buffered keys triggering a flush.
+            options: Other arguments of the policy, e.g. max_weight.
+        """
+        assert loaders > 0, "A cache needs at least one loader."
+        assert flush_interval > 0, "Flush interval must be positive."
+        assert flush_size > 0, "Flush size must be positive."
+        self.store = store
+        self.cache = policy(max_items=max_items, **options)
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        self.loaders = ThreadPoolExecutor(loaders, "cache-loader")
+        self.loading = {}  # Load in flight of every key
+        self.stale = set()  # Loading keys written since their load began
+        self.dirty = {}  # Writes not flushed yet
+        self.flushing = {}  # Writes being flushed
+        self.flush_lock = threading.Lock()  # One flush at a time
+        self.flushes = 0
+        self.flushed = 0
+        self.flush_error = None
+        self.closed = False
+        self.flusher = threading.Thread(target=self._run, daemon=True,
+                                        name="cache-flusher")
+        self.flusher.start()
+
+    @property
+    def cache_data(self):
+        """Snapshot of the cached items."""
+        with self.lock:
+            return dict(self.cache.cache_data)
+
+    def _lookup(self, key):
+        """
+        Return (True, item) if a key is cached or buffered, or else
+        (False, its load in flight or None). The lock must be held.
+        """
+        item = self.cache.get(key)
+        if item is None:
+            item = self.dirty.get(key, self.flushing.get(key))
+            if item is None:
+                return False, self.loading.get(key)
+            if item is DELETED:
+                return True, None
+        return True, item
+
+    def _load(self, keys):
+        """
+        Load keys from the store and cache them, on a loader thread.
+
+        A key written while it was loading keeps the written item: the
+        buffered one, or else the store has it by now and the key is
+        loaded again.
+        """
+        found = {}
+        try:
+            while keys:
+                started = perf_counter()
+                loaded = self.store.load_many(keys)
+                with self.lock:
+                    self.cache.record_load(perf_counter() - started)
+                    retry = []
+                    for key in keys:
+                        if key in self.stale:
+                            self.stale.discard(key)
+                            item = self.dirty.get(key,
+                                                  self.flushing.get(key))
+                            if item is None:
+                                retry.append(key)
+                                continue
+                            if item is not DELETED:
+                                found[key] = item
+                        else:
+                            item = loaded.get(key)
+                            if item is not None:
+                                self.cache.put(key, item)
+                                found[key] = item
+                        del self.loading[key]
+                keys = retry
+        except BaseException:
+            with self.lock:
+                for key in keys:
+                    self.loading.pop(key, None)
+                    self.stale.discard(key)
+            raise
+        return found
+
+    def get(self, key):
+        """
+        Get an item by key, loading it from the store on a miss.
+
+        Args:
+            key: The key of the item to retrieve.
+
+        Returns:
+            The value associated with the key, or None if the key is None
+            or is neither cached nor in the store.
+        """
+        if key is None:
+            return None
+        with self.lock:
+            hit, found = self._lookup(key)
+            if hit:
+                return found
+            load = found
+            if load is None:
+                load = self.loaders.submit(self._load, [key])
+                self.loading[key] = load
+        return load.result().get(key)
+
+    def get_many(self, keys):
+        """
+        Get several items by key, loading the misses in one batch.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            A dictionary of the keys found and their items.
+        """
+        found = {}
+        loads = {}
+        with self.lock:
+            missing = {}  # Keys to load, in order
+            for key in keys:
+                if key is None or key in found or key in loads:
+                    continue
+                hit, item = self._lookup(key)
+                if hit:
+                    if item is not None:
+                        found[key] = item
+                elif item is not None:
+                    loads[key] = item
+                else:
+                    missing[key] = None
+            if missing:
+                load = self.loaders.submit(self._load, list(missing))
+                for key in missing:
+                    self.loading[key] = loads[key] = load
+        for key, load in loads.items():
+            item = load.result().get(key)
+            if item is not None:
+                found[key] = item
+        return found
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item in the cache, and write it to the store later.
+
+        Args:
+            key: The key under which to store the item.
+            item: The item to store in the cache.
+            ttl: Seconds until the item expires from the cache, or None
+                to keep it; the store keeps it regardless.
+
+        If either key or item is None, this method does nothing.
+        """
+        if key is not None and item is not None:
+            self.put_many({key: item}, ttl)
+
+    def put_many(self, items, ttl=None):
+        """
+        Add several items in the cache, and write them to the store
+        later.
+
+        Args:
+            items: A mapping, or an iterable of (key, item) pairs.
+            ttl: Seconds until the items expire from the cache, or None
+                to keep them.
+        """
+        pairs = items.items() if hasattr(items, "items") else items
+        with self.lock:
+            for key, item in pairs:
+                if key is not None and item is not None:
+                    self.cache.put(key, item, ttl)
+                    self._buffer(key, item)
+
+    def delete_many(self, keys):
+        """
+        Remove several keys from the cache and, later, from the store.
+
+        Args:
+            keys: An iterable of keys.
+        """
+        with self.lock:
+            keys = [key for key in keys if key is not None]
+            self.cache.delete_many(keys)
+            for key in keys:
+                self._buffer(key, DELETED)
+
+    def _buffer(self, key, item):
+        """Buffer a write for the next flush. The lock must be held."""
+        if key in self.loading:
+            self.stale.add(key)
+        self.dirty[key] = item
+        if len(self.dirty) == self.flush_size:
+            self.wake.notify()
+
+    def flush(self):
+        """
+        Write the buffered writes to the store now.
+
+        Returns:
+            The number of keys written or deleted. If the store fails,
+            the writes are buffered again, unless newer ones replaced
+            them, and the error is raised.
+        """
+        with self.flush_lock:
+            with self.lock:
+                batch, self.dirty = self.dirty, {}
+                self.flushing = batch
+            if not batch:
+                return 0
+            try:
+                items = {key: item for key, item in batch.items()
+                         if item is not DELETED}
+                deleted = [key for key, item in batch.items()
+                           if item is DELETED]
+                if items:
+                    self.store.store_many(items)
+                if deleted:
+                    self.store.delete_many(deleted)
+            except BaseException:
+                with self.lock:
+                    for key, item in batch.items():
+                        self.dirty.setdefault(key, item)
+                raise
+            finally:
+                with self.lock:
+                    self.flushing = {}
+            self.flushes += 1
+            self.flushed += len(batch)
+            return len(batch)
+
+    def _run(self):
+        """
+        Flush the writes periodically, until closed.
+
+        After a failed flush the buffer stays full, so the next attempt
+        waits instead, twice as long after every failure in a row.
+        """
+        backoff = 0
+        while True:
+            with self.lock:
+                if backoff:
+                    self.wake.wait_for(lambda: self.closed,
+                                       backoff * self.flush_interval)
+                else:
+                    self.wake.wait_for(
+                        lambda: self.closed or
+                        len(self.dirty) >= self.flush_size,
+                        self.flush_interval)
+                closed = self.closed
+            try:
+                self.flush()
+                backoff = 0
+            except Exception as e:
+                # Retried at the next flush; close() raises it instead
+                self.flush_error = e
+                backoff = min(2 * backoff or 1, MAX_BACKOFF)
+            if closed:
+                return
+
+    def close(self):
+        """Flush the buffered writes and stop the threads."""
+        with self.lock:
+            self.closed = True
+            self.wake.notify()
+        self.flusher.join()
+        self.loaders.shutdown()
+        self.flush()
+
+    def __enter__(self):
+        """Return the cache, to use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the cache."""
+        self.close()
+
+    def stats(self):
+        """
+        Return the statistics of the cache, and of its writes.
+
+        Returns:
+            The dictionary of the policy's stats(), along with the number
+            of flushes, of keys flushed and of writes still buffered.
+        """
+        with self.lock:
+            stats = self.cache.stats()
+            stats.update(flushes=self.flushes, flushed=self.flushed,
+                         buffered=len(self.dirty) + len(self.flushing))
+        return stats
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Microbenchmarks of the cache policies at growing capacities.
+
+Every cache is filled to capacity, then timed on get hits, get misses,
+updates of present keys and inserts that evict. Constant-time policies
+report about the same nanoseconds per operation at every capacity.
+Results are printed as JSON.
+
+Usage:
+    ./benchmark.py --capacity 4 1000 100000 1000000 --out results.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+POLICIES = {
+    "FIFOCache": "1-fifo_cache",
+    "LIFOCache": "2-lifo_cache",
+    "LRUCache": "3-lru_cache",
+    "MRUCache": "4-mru_cache",
+    "LFUCache": "100-lfu_cache",
+    "ARCCache": "101-arc_cache",
+    "WTinyLFUCache": "102-tinylfu_cache",
+}
+
+
+def load_policy(name: str):
+    """Import a cache class by name."""
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    return getattr(__import__(POLICIES[name]), name)
+
+
+def ns_per_op(call, arguments: List) -> float:
+    """Average nanoseconds of call(argument) over the arguments."""
+    started = time.perf_counter_ns()
+    for argument in arguments:
+        call(argument)
+    return round((time.perf_counter_ns() - started) / len(arguments), 1)
+
+
+def bench_policy(name: str, capacity: int, operations: int,
+                 seed: int = 0) -> Dict:
+    """Time the operations of one policy at one capacity."""
+    rng = random.Random(seed)
+    cache = load_policy(name)(capacity)
+    present = list(range(capacity))
+    hits = [rng.choice(present) for _ in range(operations)]
+    misses = [-1 - i for i in range(operations)]
+    inserts = range(capacity, capacity + operations)
+    for key in present:
+        cache.put(key, key)
+    result = {
+        "policy": name,
+        "capacity": capacity,
+        "get_hit_ns": ns_per_op(cache.get, hits),
+        "get_miss_ns": ns_per_op(cache.get, misses),
+        "put_update_ns": ns_per_op(lambda k: cache.put(k, k), hits),
+        "put_evict_ns": ns_per_op(lambda k: cache.put(k, k), inserts),
+    }
+    assert len(cache.cache_data) <= capacity, "Capacity exceeded."
+    return result
+
+
+def main():
+    """Run every policy at every capacity and report JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--capacity", type=int, nargs="+",
+                        default=[4, 1000, 100000, 1000000])
+    parser.add_argument("--operations", type=int, default=100000)
+    parser.add_argument("--policy", nargs="+", default=list(POLICIES),
+                        choices=list(POLICIES))
+    parser.add_argument("--out", help="Also write the results here.")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.policy:
+        for capacity in args.capacity:
+            results.append(bench_policy(name, capacity, args.operations))
+            print(json.dumps(results[-1]), file=sys.stderr)
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "operations": args.operations,
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+""" Bulk module """
+from events import REMOVED
+
+
+class BulkMixin:
+    """
+    Batched operations for the cache policies.
+
+    get_many, put_many and delete_many give the same results as get,
+    put and removals made one key at a time, in order. The versions
+    here do exactly that; a policy overrides them when a batch can skip
+    per-key work, for instance by discarding once for the whole batch.
+
+    A policy using it implements _remove(key), and the TTL and event
+    hooks of TTLMixin.
+    """
+
+    def get_many(self, keys):
+        """
+        Get several items by key.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            A dictionary of the keys found in the cache and their items.
+        """
+        found = {}
+        for key in keys:
+            item = self.get(key)
+            if item is not None:
+                found[key] = item
+        return found
+
+    def _get_many(self, keys, touch=None):
+        """
+        Look keys up in one pass, when none of them can be expired.
+
+        Args:
+            keys: An iterable of keys.
+            touch: Function called with every key found, in order.
+
+        Returns:
+            A dictionary of the keys found in the cache and their items.
+        """
+        data = self.cache_data
+        found = {}
+        hits = misses = 0
+        for key in keys:
+            if key is not None and key in data:
+                if touch is not None:
+                    touch(key)
+                found[key] = data[key]
+                hits += 1
+            else:
+                misses += 1
+        self.hits += hits
+        self.misses += misses
+        return found
+
+    def put_many(self, items, ttl=None):
+        """
+        Add several items in the cache.
+
+        Args:
+            items: A mapping, or an iterable of (key, item) pairs.
+            ttl: Seconds until the items expire, or None to keep them.
+
+        Pairs whose key or item is None are skipped, as with put().
+        """
+        pairs = items.items() if hasattr(items, "items") else items
+        for key, item in pairs:
+            self.put(key, item, ttl)
+
+    def delete_many(self, keys):
+        """
+        Remove several keys from the cache.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            The number of keys that were cached.
+        """
+        data = self.cache_data
+        deleted = 0
+        for key in keys:
+            self._expire_due(key)
+            if key is not None and key in data:
+                item = data[key]
+                self._remove(key)
+                self._forget(key)
+                self._notify(REMOVED, key, item)
+                deleted += 1
+        return deleted
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+""" Events module """
+from itertools import count
+from time import perf_counter_ns
+
+EVICTED = "evicted"  # Dropped to respect the capacity
+EXPIRED = "expired"  # Dropped when its TTL ran out
+REMOVED = "removed"  # Deleted or invalidated by the caller
+
+
+def print_listener(event, key, item):
+    """
+    Listener printing evictions and expirations, as the caches did
+    before listeners existed.
+
+    Args:
+        event: EVICTED, EXPIRED or REMOVED.
+        key: The key that left the cache.
+        item: Its item.
+    """
+    if event == EVICTED:
+        print(f"DISCARD: {key}")
+    elif event == EXPIRED:
+        print(f"EXPIRED: {key}")
+
+
+class EventsMixin:
+    """
+    Listeners and statistics for the cache policies.
+
+    Every key leaving the cache is reported to the listeners as
+    listener(event, key, item), and counted. Counters are plain
+    integers updated in place, with no lock of their own: a cache is
+    used by one thread, or by ShardedCache which locks each segment.
+    Latency sampling is off until sample_latency() is called, and then
+    times one call in every few.
+    """
+
+    def __init__(self):
+        """Initialize the cache and its counters"""
+        super().__init__()
+        self.listeners = []
+        self.hits = 0
+        self.misses = 0
+        self.events = {EVICTED: 0, EXPIRED: 0, REMOVED: 0}
+        self.loads = 0
+        self.load_time = 0.0
+        self.latency = {}
+
+    def add_listener(self, listener):
+        """Call listener(event, key, item) whenever a key leaves."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stop calling a listener."""
+        self.listeners.remove(listener)
+
+    def _notify(self, event, key, item):
+        """Count a key leaving the cache and tell the listeners."""
+        self.events[event] += 1
+        for listener in self.listeners:
+            listener(event, key, item)
+
+    def record_load(self, seconds):
+        """Count a miss that was loaded from the backing source."""
+        self.loads += 1
+        self.load_time += seconds
+
+    def sample_latency(self, every=64):
+        """
+        Time one get and one put call in every, into histograms.
+
+        Args:
+            every: Sampling period; 1 times every call.
+        """
+        assert every > 0, "Sampling period must be positive."
+        for name in ("get", "put"):
+            self.latency[name] = {}
+            # The instance attribute shadows the method of the class
+            setattr(self, name, self._sampled(name, every))
+
+    def _sampled(self, name, every):
+        """Return the method name of the class, timed one call in every."""
+        method = getattr(type(self), name)
+        histogram = self.latency[name]
+        ticks = count()
+
+        def sampled(*args, **kwargs):
+            if next(ticks) % every:
+                return method(self, *args, **kwargs)
+            started = perf_counter_ns()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                # Bucket by the next power of two in nanoseconds
+                bucket = 1 << (perf_counter_ns() - started).bit_length()
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+        return sampled
+
+    def stats(self):
+        """
+        Return a snapshot of the cache statistics.
+
+        Returns:
+            A dictionary of the hit and miss counts and ratio, the
+            number of evicted, expired and removed keys, the loads and
+            their total time in seconds, the current size and, when
+            sampled, latency histograms (upper bound in ns to count).
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.events[EVICTED],
+            "expirations": self.events[EXPIRED],
+            "removals": self.events[REMOVED],
+            "loads": self.loads,
+            "load_time": self.load_time,
+            "size": len(self.cache_data),
+            "latency_ns": {name: dict(sorted(histogram.items()))
+                           for name, histogram in self.latency.items()},
+        }
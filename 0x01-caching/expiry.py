@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+""" Expiry module """
+import time
+
+from events import EXPIRED, EventsMixin
+
+
+class TTLMixin(EventsMixin):
+    """
+    Per-entry time-to-live for the cache policies.
+
+    Deadlines are filed in a timer wheel: a dict of slots, each holding
+    the keys due within one RESOLUTION-long period. Every get and put
+    first sweeps the slots that have fully elapsed since the last sweep,
+    so an entry is expired in amortized O(1) without scanning
+    cache_data; a key due within the current slot is caught lazily when
+    it is read. Expired entries are reported to the listeners as
+    EXPIRED, apart from the EVICTED keys of capacity evictions.
+
+    A policy using it calls _expire_due(key) at the start of get and
+    put, _set_ttl(key, ttl) after storing an item and _forget(key) when
+    it evicts a key, and implements _remove(key).
+    """
+    RESOLUTION = 1.0  # Seconds covered by one wheel slot
+
+    def __init__(self):
+        """Initialize the cache and its timer wheel"""
+        super().__init__()
+        self.clock = time.monotonic
+        self.deadlines = {}  # Deadline of every key with a TTL
+        self.wheel = {}  # Keys by deadline slot
+        self.swept_slot = int(self.clock() // self.RESOLUTION)
+
+    def _remove(self, key):
+        """Remove a key from the cache and the policy's bookkeeping."""
+        raise NotImplementedError("_remove must be implemented")
+
+    def _forget(self, key):
+        """Drop the bookkeeping of a key that left the cache."""
+        if self.deadlines:
+            self.deadlines.pop(key, None)
+        if hasattr(super(), "_forget"):
+            # Let the weight budget forget the key as well
+            super()._forget(key)
+
+    def _set_ttl(self, key, ttl):
+        """Make a key expire in ttl seconds, or never if ttl is None."""
+        if ttl is None:
+            if self.deadlines:
+                self.deadlines.pop(key, None)
+            return
+        assert ttl > 0, "TTL must be positive."
+        deadline = self.clock() + ttl
+        self.deadlines[key] = deadline
+        # A key moved to a later slot stays filed in the old one; the
+        # sweep skips it there because its deadline no longer matches
+        self.wheel.setdefault(int(deadline // self.RESOLUTION),
+                              set()).add(key)
+
+    def _expire(self, key):
+        """Drop an expired key."""
+        item = self.cache_data.get(key)
+        self._remove(key)
+        self._forget(key)
+        self._notify(EXPIRED, key, item)
+
+    def _expire_due(self, key=None):
+        """
+        Sweep the elapsed wheel slots, then expire key if it is due.
+
+        Args:
+            key: A key about to be read or written, or None.
+        """
+        if not self.deadlines:
+            # Nothing can expire; stale wheel slots are dropped lazily
+            return
+        now = self.clock()
+        current = int(now // self.RESOLUTION)
+        if current > self.swept_slot:
+            slots = range(self.swept_slot, current)
+            if len(slots) > len(self.wheel):
+                # After a long idle period, visit only the filled slots
+                slots = sorted(slot for slot in self.wheel
+                               if slot < current)
+            for slot in slots:
+                for due in self.wheel.pop(slot, ()):
+                    deadline = self.deadlines.get(due)
+                    if deadline is not None and deadline <= now:
+                        self._expire(due)
+            self.swept_slot = current
+        deadline = self.deadlines.get(key)
+        if deadline is not None and deadline <= now:
+            self._expire(key)
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Hit-ratio comparison of the cache policies on synthetic traces.
+
+Every trace is replayed against every policy as a read-through cache
+(a get, then a put on a miss). The traces are a Zipf-distributed hot
+set, the same hot set interrupted by periodic scans of one-off keys, a
+hot set replaced by another one halfway through, and a loop slightly
+larger than the cache. Results are printed as JSON.
+
+Usage:
+    ./hit_ratio.py --capacity 1000 --requests 200000 --out results.json
+"""
+import argparse
+import json
+import random
+import sys
+from itertools import accumulate
+from typing import Dict, List
+
+from benchmark import POLICIES, load_policy
+
+
+def zipf_trace(keys: int, requests: int, alpha: float = 0.9,
+               seed: int = 0) -> List[int]:
+    """Return requests drawn from keys with Zipf popularity."""
+    rng = random.Random(seed)
+    weights = accumulate(1 / (rank ** alpha) for rank in range(1, keys + 1))
+    return rng.choices(range(keys), cum_weights=list(weights), k=requests)
+
+
+def scan_trace(keys: int, requests: int, scan_every: int,
+               scan_length: int, seed: int = 0) -> List[int]:
+    """Return a Zipf trace with a scan of new keys every scan_every."""
+    trace = []
+    fresh = keys
+    for position, key in enumerate(zipf_trace(keys, requests, seed=seed)):
+        if position and position % scan_every == 0:
+            trace.extend(range(fresh, fresh + scan_length))
+            fresh += scan_length
+        trace.append(key)
+    return trace
+
+
+def shifting_trace(keys: int, requests: int, seed: int = 0) -> List[int]:
+    """Return a Zipf trace whose popular keys change halfway."""
+    trace = zipf_trace(keys, requests, seed=seed)
+    half = requests // 2
+    return trace[:half] + [key + keys for key in trace[half:]]
+
+
+def loop_trace(keys: int, requests: int) -> List[int]:
+    """Return requests cycling over keys in order."""
+    return [position % keys for position in range(requests)]
+
+
+def hit_ratio(name: str, capacity: int, trace: List[int]) -> float:
+    """Replay a trace against a policy and return its hit ratio."""
+    cache = load_policy(name)(capacity)
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+    return round(cache.stats()["hit_ratio"], 4)
+
+
+def main():
+    """Replay every trace against every policy and report JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--capacity", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--policy", nargs="+", default=list(POLICIES),
+                        choices=list(POLICIES))
+    parser.add_argument("--out", help="Also write the results here.")
+    args = parser.parse_args()
+
+    keys = args.capacity * 20
+    traces = {
+        "zipf": zipf_trace(keys, args.requests),
+        "zipf_with_scans": scan_trace(keys, args.requests,
+                                      args.requests // 10,
+                                      args.capacity * 2),
+        "shifting_zipf": shifting_trace(keys, args.requests),
+        "loop": loop_trace(args.capacity * 6 // 5, args.requests),
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for trace_name, trace in traces.items():
+        results[trace_name] = {
+            name: hit_ratio(name, args.capacity, trace)
+            for name in args.policy}
+        print(json.dumps({trace_name: results[trace_name]}),
+              file=sys.stderr)
+
+    report = {
+        "capacity": args.capacity,
+        "requests": args.requests,
+        "hit_ratio": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+""" Memoize module """
+import asyncio
+import contextlib
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+from time import perf_counter
+
+from sharded_cache import ShardedCache
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+KWARGS_MARK = object()  # Separates positional from keyword arguments
+NONE = object()  # Stands for a None result, which caches cannot hold
+
+
+def make_key(args, kwargs):
+    """
+    Return a cache key for the arguments of a call.
+
+    Args:
+        args: Positional arguments, which must be hashable.
+        kwargs: Keyword arguments, which must be hashable.
+
+    Returns:
+        A single int or str argument as is, or else a tuple of them all.
+    """
+    if not kwargs and len(args) == 1 and type(args[0]) in (int, str):
+        return args[0]
+    if kwargs:
+        return args + (KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return args
+
+
+def cached(policy=LRUCache, max_items=None, ttl=None, key=make_key,
+           **options):
+    """
+    Decorator caching the results of a function, or of a coroutine
+    function, in a cache of the given policy.
+
+    Concurrent calls missing the same key share one call of the
+    function: the first one runs it while the others wait for its
+    result, or its exception, which is not cached. A None result is
+    cached too.
+
+    Calls only share a lock while they register or end a load. The
+    cache is used under its own segment locks if it is a ShardedCache,
+    and behind one lock otherwise.
+
+    Args:
+        policy: Cache class; it must accept a max_items keyword.
+        max_items: Capacity of the cache, the policy's default if None.
+        ttl: Seconds until a result expires, or None to keep it.
+        key: Function building the cache key from (args, kwargs).
+        options: Other arguments of the policy, e.g. max_weight.
+
+    The wrapper has the cache as its cache attribute, for stats(), and
+    an invalidate(*args, **kwargs) method forgetting one result, even
+    one still being computed.
+
+    Usage:
+        @cached(policy=LRUCache, max_items=100, ttl=60)
+        def get_user(user_id):
+            ...
+    """
+    def decorator(func):
+        cache = policy(max_items=max_items, **options)
+        # ShardedCache locks its own segments; other policies need one
+        if isinstance(cache, ShardedCache):
+            cache_lock = contextlib.nullcontext()
+        else:
+            cache_lock = threading.Lock()
+        lock = threading.Lock()  # Guards pending
+        pending = {}  # Loads in flight, by key
+
+        def lookup(k):
+            """Return (True, result) if a key is cached, or (False, None)."""
+            with cache_lock:
+                value = cache.get(k)
+            if value is None:
+                return False, None
+            return True, None if value is NONE else value
+
+        def discard(k, flight):
+            """End the load flight of a key. The lock must be held."""
+            if pending.get(k) is flight:
+                del pending[k]
+
+        def store(k, flight, value, started):
+            """
+            End the load flight of a key and cache its result, unless
+            invalidate() ended it first. The lock must be held.
+            """
+            current = pending.get(k) is flight
+            discard(k, flight)
+            with cache_lock:
+                cache.record_load(perf_counter() - started)
+                if current:
+                    cache.put(k, NONE if value is None else value, ttl)
+
+        if inspect.iscoroutinefunction(func):
+            async def load(k, args, kwargs):
+                task = asyncio.current_task()
+                started = perf_counter()
+                try:
+                    value = await func(*args, **kwargs)
+                except BaseException:
+                    with lock:
+                        discard(k, task)
+                    raise
+                with lock:
+                    store(k, task, value, started)
+                return value
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                k = key(args, kwargs)
+                hit, value = lookup(k)
+                if hit:
+                    return value
+                with lock:
+                    task = pending.get(k)
+                    if task is None:
+                        task = asyncio.ensure_future(load(k, args, kwargs))
+                        pending[k] = task
+                # A cancelled caller leaves the load running for the others
+                return await asyncio.shield(task)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                k = key(args, kwargs)
+                hit, value = lookup(k)
+                if hit:
+                    return value
+                with lock:
+                    flight = pending.get(k)
+                    leader = flight is None
+                    if leader:
+                        flight = pending[k] = Future()
+                if not leader:
+                    return flight.result()
+                started = perf_counter()
+                try:
+                    value = func(*args, **kwargs)
+                except BaseException as e:
+                    with lock:
+                        discard(k, flight)
+                    flight.set_exception(e)
+                    raise
+                with lock:
+                    store(k, flight, value, started)
+                flight.set_result(value)
+                return value
+
+        def invalidate(*args, **kwargs):
+            """
+            Forget the cached result of a call with these arguments. A
+            load in flight still answers its callers, but is not cached.
+            """
+            k = key(args, kwargs)
+            with lock:
+                pending.pop(k, None)
+                with cache_lock:
+                    cache.delete_many([k])
+
+        wrapper.cache = cache
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
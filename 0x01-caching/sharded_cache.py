@@ -0,0 +1,225 @@
+#!/usr/bin/python3
+""" ShardedCache module """
+import threading
+
+from base_caching import BaseCaching
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class ShardedCache(BaseCaching):
+    """
+    ShardedCache class that inherits from BaseCaching.
+    A thread-safe cache made of independently locked segments.
+
+    Keys are hash-partitioned across the segments, each one an ordinary
+    cache of the chosen policy behind its own lock, so threads working
+    on different segments do not wait for each other. Eviction happens
+    per segment: the policy applies among the keys of a segment.
+    """
+
+    def __init__(self, policy=LRUCache, segments=16, max_items=None,
+                 max_weight=None, weigher=None):
+        """
+        Initialize the cache
+
+        Args:
+            policy: Cache class used for every segment; it must accept
+                a max_items argument, and max_weight and weigher ones
+                when a weight budget is given.
+            segments: Number of segments (and locks), at most
+                max_items.
+            max_items: Total capacity, BaseCaching.MAX_ITEMS by default
+                (no limit when max_weight is given). It is split as
+                evenly as possible among the segments.
+            max_weight: Total weight budget, or None. Each segment gets
+                an equal share, which also bounds the heaviest item.
+            weigher: Function returning the weight of an item.
+        """
+        # cache_data is a merged view of the segments, not a dict to fill
+        if max_items is None and max_weight is None:
+            max_items = BaseCaching.MAX_ITEMS
+        self.max_items = max_items
+        self.max_weight = max_weight
+        assert segments > 0, "A cache needs at least one segment."
+        items = [None] * segments
+        if max_items is not None:
+            assert max_items > 0, "A cache needs room for one item."
+            # Segments hold at least one item, and add up to max_items
+            segments = min(segments, max_items)
+            share, extra = divmod(max_items, segments)
+            items = [share + (i < extra) for i in range(segments)]
+        options = {}
+        if max_weight is not None:
+            options = {"max_weight": max_weight / segments,
+                       "weigher": weigher}
+        self.segments = [policy(size, **options) for size in items]
+        self.locks = [threading.Lock() for _ in range(segments)]
+        # Loads are not tied to a segment; counted here, under their lock
+        self.load_lock = threading.Lock()
+        self.loads = 0
+        self.load_time = 0.0
+
+    def add_listener(self, listener):
+        """
+        Call listener(event, key, item) whenever a key leaves any
+        segment. It runs under the lock of that segment, so it must not
+        use the cache itself.
+        """
+        for segment in self.segments:
+            segment.add_listener(listener)
+
+    def remove_listener(self, listener):
+        """Stop calling a listener."""
+        for segment in self.segments:
+            segment.remove_listener(listener)
+
+    def record_load(self, seconds):
+        """Count a miss that was loaded from the backing source."""
+        with self.load_lock:
+            self.loads += 1
+            self.load_time += seconds
+
+    def stats(self):
+        """
+        Return the statistics of every segment, added up.
+
+        Returns:
+            A dictionary with the keys of the segment stats(); counters
+            and latency histograms are summed and the hit ratio is that
+            of the summed hits and misses.
+        """
+        total = {}
+        latency = {}
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                stats = segment.stats()
+            for name, histogram in stats.pop("latency_ns").items():
+                merged = latency.setdefault(name, {})
+                for bucket, calls in histogram.items():
+                    merged[bucket] = merged.get(bucket, 0) + calls
+            for name, value in stats.items():
+                total[name] = total.get(name, 0) + value
+        with self.load_lock:
+            total["loads"] += self.loads
+            total["load_time"] += self.load_time
+        lookups = total["hits"] + total["misses"]
+        total["hit_ratio"] = total["hits"] / lookups if lookups else 0.0
+        total["latency_ns"] = {name: dict(sorted(histogram.items()))
+                               for name, histogram in latency.items()}
+        return total
+
+    def segment_of(self, key):
+        """Return the index of the segment holding a key."""
+        return hash(key) % len(self.segments)
+
+    @property
+    def cache_data(self):
+        """Snapshot of every cached item, across all segments."""
+        items = {}
+        for segment, lock in zip(self.segments, self.locks):
+            with lock:
+                items.update(segment.cache_data)
+        return items
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item in the cache.
+
+        Args:
+            key: The key under which to store the item.
+            item: The item to store in the cache.
+            ttl: Seconds until the item expires, or None to keep it.
+
+        If either key or item is None, this method does nothing.
+        If the key's segment is full, its policy discards an item.
+        """
+        if key is not None and item is not None:
+            index = self.segment_of(key)
+            with self.locks[index]:
+                self.segments[index].put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Get an item by key.
+
+        Args:
+            key: The key of the item to retrieve.
+
+        Returns:
+            The value associated with the key, or None if the key is None,
+            does not exist in the cache or has expired.
+        """
+        if key is None:
+            return None
+        index = self.segment_of(key)
+        with self.locks[index]:
+            return self.segments[index].get(key)
+
+    def _by_segment(self, keys):
+        """Group keys by segment index, keeping their order."""
+        # Inlines segment_of(), which dominates the cost of a batch
+        segments = len(self.segments)
+        groups = {}
+        for key in keys:
+            if key is not None:
+                index = hash(key) % segments
+                if index in groups:
+                    groups[index].append(key)
+                else:
+                    groups[index] = [key]
+        return groups
+
+    def get_many(self, keys):
+        """
+        Get several items by key, locking each segment once.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            A dictionary of the keys found in the cache and their items.
+        """
+        found = {}
+        for index, group in self._by_segment(keys).items():
+            with self.locks[index]:
+                found.update(self.segments[index].get_many(group))
+        return found
+
+    def put_many(self, items, ttl=None):
+        """
+        Add several items in the cache, locking each segment once.
+
+        Args:
+            items: A mapping, or an iterable of (key, item) pairs.
+            ttl: Seconds until the items expire, or None to keep them.
+        """
+        pairs = items.items() if hasattr(items, "items") else items
+        segments = len(self.segments)
+        groups = {}
+        for key, item in pairs:
+            if key is not None and item is not None:
+                index = hash(key) % segments
+                if index in groups:
+                    groups[index].append((key, item))
+                else:
+                    groups[index] = [(key, item)]
+        for index, group in groups.items():
+            with self.locks[index]:
+                self.segments[index].put_many(group, ttl)
+
+    def delete_many(self, keys):
+        """
+        Remove several keys from the cache, locking each segment once.
+
+        Args:
+            keys: An iterable of keys.
+
+        Returns:
+            The number of keys that were cached.
+        """
+        deleted = 0
+        for index, group in self._by_segment(keys).items():
+            with self.locks[index]:
+                deleted += self.segments[index].delete_many(group)
+        return deleted
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+""" Sketch module """
+
+# Halves every byte of a table in one bytes.translate() call
+HALVE = bytes(i >> 1 for i in range(256))
+SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+         0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+MASK64 = (1 << 64) - 1
+
+
+class CountMinSketch:
+    """
+    Approximate access counts of keys, in a fixed amount of memory.
+
+    Four rows of small counters are indexed by four hashes of a key;
+    the estimate of a key is its smallest counter, which can only
+    overestimate. Counters saturate at 15, and once sample_size
+    accesses were recorded every counter is halved, so the sketch
+    follows the recent popularity of keys rather than their all-time
+    counts.
+    """
+    MAX_COUNT = 15
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity: Number of keys the cache holds; the sketch gets at
+                least as many counters per row, rounded up to a power
+                of two, and ages after ten times as many accesses.
+        """
+        width = 1
+        while width < max(capacity, 16):
+            width <<= 1
+        self.width = width
+        self.shift = 64 - width.bit_length() + 1
+        self.table = bytearray(4 * width)
+        self.sample_size = 10 * width
+        self.additions = 0
+
+    def _slots(self, key):
+        """Return the counter index of a key in every row."""
+        h = hash(key) & MASK64
+        width, shift = self.width, self.shift
+        return ((((h * SEEDS[0]) & MASK64) >> shift),
+                width + (((h * SEEDS[1]) & MASK64) >> shift),
+                2 * width + (((h * SEEDS[2]) & MASK64) >> shift),
+                3 * width + (((h * SEEDS[3]) & MASK64) >> shift))
+
+    def increment(self, key):
+        """Record one access to a key."""
+        table = self.table
+        for slot in self._slots(key):
+            if table[slot] < self.MAX_COUNT:
+                table[slot] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.table = bytearray(self.table.translate(HALVE))
+            self.additions //= 2
+
+    def frequency(self, key):
+        """Return the estimated recent access count of a key."""
+        a, b, c, d = self._slots(key)
+        table = self.table
+        return min(table[a], table[b], table[c], table[d])
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+""" Store module """
+import pickle
+import sqlite3
+import threading
+
+# Keys per SELECT, under the 999 variables older SQLite versions allow
+CHUNK = 500
+
+
+class Store:
+    """
+    Backing store of a BackedCache, where the items come from and are
+    written back to. Every method handles a batch of keys in as few
+    round trips to the backend as it can.
+    """
+
+    def load_many(self, keys):
+        """
+        Args:
+            keys: A list of keys.
+
+        Returns:
+            A dictionary of the keys found and their items.
+        """
+        raise NotImplementedError("load_many must be implemented")
+
+    def store_many(self, items):
+        """
+        Args:
+            items: A dictionary of keys and the items to write.
+        """
+        raise NotImplementedError("store_many must be implemented")
+
+    def delete_many(self, keys):
+        """
+        Args:
+            keys: A list of keys to delete; missing keys are ignored.
+        """
+        raise NotImplementedError("delete_many must be implemented")
+
+
+class SQLiteStore(Store):
+    """
+    Store keeping pickled keys and items in a SQLite table.
+
+    One connection is shared by every thread behind a lock. Each call
+    is one transaction, and round_trips counts the statements sent, to
+    compare caching strategies.
+    """
+
+    def __init__(self, path=":memory:", table="items"):
+        """
+        Args:
+            path: Database file, in memory by default.
+            table: Name of the table, created if needed.
+        """
+        assert table.isidentifier(), "Table name must be an identifier."
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.table = table
+        self.lock = threading.Lock()
+        self.round_trips = 0
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key BLOB PRIMARY KEY, item BLOB NOT NULL)")
+
+    def load_many(self, keys):
+        """Return the items of the keys found in the table."""
+        blobs = [pickle.dumps(key) for key in keys]
+        found = {}
+        with self.lock:
+            for start in range(0, len(blobs), CHUNK):
+                chunk = blobs[start:start + CHUNK]
+                marks = ", ".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT key, item FROM {self.table} "
+                    f"WHERE key IN ({marks})", chunk)
+                self.round_trips += 1
+                for key, item in rows:
+                    found[pickle.loads(key)] = pickle.loads(item)
+        return found
+
+    def store_many(self, items):
+        """Insert or replace items in one transaction."""
+        rows = [(pickle.dumps(key), pickle.dumps(item))
+                for key, item in items.items()]
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?)", rows)
+            self.round_trips += 1
+
+    def delete_many(self, keys):
+        """Delete keys in one transaction."""
+        rows = [(pickle.dumps(key),) for key in keys]
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f"DELETE FROM {self.table} WHERE key = ?", rows)
+            self.round_trips += 1
+
+    def close(self):
+        """Close the connection."""
+        with self.lock:
+            self.connection.close()
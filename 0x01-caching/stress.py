@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+Concurrent stress test of ShardedCache with every cache policy.
+
+Threads hammer one shared cache with random gets and puts while the
+interpreter switches threads as often as it can. The policy invariants
+of every segment are then checked, along with every value read.
+Throughput is reported for one segment (a global lock) against many.
+
+Usage:
+    ./stress.py --threads 8 --operations 20000
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from benchmark import POLICIES, load_policy
+from sharded_cache import ShardedCache
+
+
+def check_invariants(cache: ShardedCache) -> List[str]:
+    """Return the broken invariants of every segment of a cache."""
+    errors = []
+    for index, segment in enumerate(cache.segments):
+        keys = set(segment.cache_data)
+        if len(keys) > segment.max_items:
+            errors.append(f"segment {index} holds {len(keys)} items")
+        if any(cache.segment_of(key) != index for key in keys):
+            errors.append(f"segment {index} holds a foreign key")
+        if hasattr(segment, "buckets"):
+            bucketed = {key: freq for freq, bucket in segment.buckets.items()
+                        for key in bucket}
+            if not (keys == set(segment.frequency) ==
+                    set(segment.usage_order) == set(bucketed)):
+                errors.append(f"segment {index} bookkeeping lost keys")
+            if bucketed != segment.frequency:
+                errors.append(f"segment {index} buckets disagree")
+            if keys and segment.min_frequency != min(segment.buckets):
+                errors.append(f"segment {index} min_frequency is stale")
+        if hasattr(segment, "t1"):
+            lists = (segment.t1, segment.t2, segment.b1, segment.b2)
+            if keys != set(segment.t1) | set(segment.t2):
+                errors.append(f"segment {index} lost ARC keys")
+            if len(segment.t1) + len(segment.b1) > segment.max_items or \
+                    sum(map(len, lists)) > 2 * segment.max_items:
+                errors.append(f"segment {index} ghost lists overflow")
+        if hasattr(segment, "window"):
+            parts = (segment.window, segment.probation, segment.protected)
+            if keys != set().union(*parts) or \
+                    sum(map(len, parts)) != len(keys):
+                errors.append(f"segment {index} lost W-TinyLFU keys")
+        recent = getattr(segment, "most_recent_key", None)
+        if recent is not None and recent not in keys:
+            errors.append(f"segment {index} most recent key was evicted")
+    return errors
+
+
+def hammer(cache: ShardedCache, threads: int, operations: int,
+           keys: int) -> Dict:
+    """Run concurrent gets and puts, returning errors and throughput."""
+    errors = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        try:
+            for n in range(operations):
+                key = rng.randrange(keys)
+                if rng.random() < 0.5:
+                    cache.put(key, (key, seed, n))
+                else:
+                    value = cache.get(key)
+                    if value is not None and value[0] != key:
+                        errors.append(f"get({key}) returned {value}")
+        except Exception as e:
+            errors.append(repr(e))
+
+    pool = [threading.Thread(target=worker, args=(seed,))
+            for seed in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {"errors": errors + check_invariants(cache),
+            "ops_per_s": round(threads * operations / elapsed)}
+
+
+def main():
+    """Stress every policy and report JSON; exit 1 on any error."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--segments", type=int, default=16)
+    parser.add_argument("--max-items", type=int, default=256)
+    args = parser.parse_args()
+
+    results = []
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for name in POLICIES:
+            for segments in (1, args.segments):
+                cache = ShardedCache(load_policy(name), segments,
+                                     args.max_items)
+                result = hammer(cache, args.threads, args.operations,
+                                args.max_items * 4)
+                results.append(dict(result, policy=name,
+                                    segments=segments))
+    finally:
+        sys.setswitchinterval(interval)
+
+    print(json.dumps(results, indent=2))
+    if any(result["errors"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+""" Tests of the BackedCache module """
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from backed_cache import BackedCache  # noqa: E402
+from sharded_cache import ShardedCache  # noqa: E402
+from store import SQLiteStore, Store  # noqa: E402
+
+
+class FailingStore(Store):
+    """ Store whose writes fail until it is repaired """
+
+    def __init__(self):
+        """ Start broken and empty """
+        self.items = {}
+        self.broken = True
+        self.store_calls = 0
+
+    def load_many(self, keys):
+        """ Return the stored items of keys """
+        return {key: self.items[key] for key in keys if key in self.items}
+
+    def store_many(self, items):
+        """ Count the call, and fail while broken """
+        self.store_calls += 1
+        if self.broken:
+            raise OSError("store is down")
+        self.items.update(items)
+
+    def delete_many(self, keys):
+        """ Delete keys """
+        for key in keys:
+            self.items.pop(key, None)
+
+
+class TestBackedCache(unittest.TestCase):
+    """ Tests of BackedCache """
+
+    def test_read_through_and_write_behind(self):
+        """ Misses load from the store, writes reach it on close """
+        store = SQLiteStore()
+        store.store_many({"A": 1})
+        with BackedCache(store, max_items=4) as cache:
+            self.assertEqual(cache.get("A"), 1)
+            cache.put("B", 2)
+            self.assertEqual(cache.get("B"), 2)
+        self.assertEqual(store.load_many(["A", "B"]), {"A": 1, "B": 2})
+
+    def test_sharded_cache_policy(self):
+        """ ShardedCache, whose first argument is a policy, works """
+        store = SQLiteStore()
+        store.store_many({"A": 1})
+        with BackedCache(store, policy=ShardedCache, max_items=8) as cache:
+            self.assertEqual(cache.get("A"), 1)
+            self.assertEqual(cache.get("A"), 1)
+            self.assertEqual(cache.stats()["loads"], 1)
+
+    def test_failed_flushes_back_off(self):
+        """ A failing store is retried with growing waits """
+        store = FailingStore()
+        cache = BackedCache(store, max_items=4, flush_interval=0.05,
+                            flush_size=1)
+        cache.put("A", 1)
+        time.sleep(0.5)
+        # Waits of 1, 2, 4 and 8 flush intervals fit in 0.5 seconds
+        self.assertLessEqual(store.store_calls, 6)
+        self.assertIsInstance(cache.flush_error, OSError)
+        self.assertEqual(cache.stats()["buffered"], 1)
+        store.broken = False
+        cache.close()
+        self.assertEqual(store.items, {"A": 1})
+        self.assertEqual(cache.stats()["buffered"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+""" Tests of the Bulk module """
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from sharded_cache import ShardedCache  # noqa: E402
+
+POLICIES = [
+    ('0-basic_cache', 'BasicCache'),
+    ('1-fifo_cache', 'FIFOCache'),
+    ('2-lifo_cache', 'LIFOCache'),
+    ('3-lru_cache', 'LRUCache'),
+    ('4-mru_cache', 'MRUCache'),
+    ('100-lfu_cache', 'LFUCache'),
+    ('101-arc_cache', 'ARCCache'),
+    ('102-tinylfu_cache', 'WTinyLFUCache'),
+]
+WEIGHTED = ('FIFOCache', 'LIFOCache', 'LRUCache', 'MRUCache', 'LFUCache')
+STATE = ('most_recent_key', 'min_frequency', 'frequency', 'p')
+QUEUES = ('t1', 't2', 'b1', 'b2', 'window', 'probation', 'protected')
+
+
+def make(module, name, mode, sharded):
+    """ Build a small cache of a policy for one test mode """
+    policy = getattr(__import__(module), name)
+    options = {}
+    if mode == "weight" and name in WEIGHTED:
+        options = {"max_weight": 12, "weigher": lambda v: v % 5 + 1}
+    if sharded:
+        return ShardedCache(policy, 3, 9, **options)
+    if name == "BasicCache":
+        return policy()
+    return policy(5, **options)
+
+
+def state(cache):
+    """ Return the contents, counters and policy state of a cache """
+    segments = getattr(cache, "segments", [cache])
+    return [(list(s.cache_data.items()), s.hits, s.misses, dict(s.events),
+             {k: getattr(s, k) for k in STATE if hasattr(s, k)},
+             [list(getattr(s, q)) for q in QUEUES if hasattr(s, q)])
+            for s in segments]
+
+
+def listen(cache):
+    """ Record the events of each segment of a cache in its own list """
+    events = []
+    for segment in getattr(cache, "segments", [cache]):
+        events.append([])
+        segment.add_listener(lambda *e, seen=events[-1]: seen.append(e))
+    return events
+
+
+class TestBulk(unittest.TestCase):
+    """ Batch calls must behave exactly like one call per key """
+
+    def check(self, module, name, mode, sharded):
+        """ Replay random traces in batches and one key at a time """
+        for trial in range(30):
+            rng = random.Random(trial)
+            batch = make(module, name, mode, sharded)
+            single = make(module, name, mode, sharded)
+            # Batches visit one segment at a time: compare per segment
+            batch_events = listen(batch)
+            single_events = listen(single)
+            for step in range(30):
+                where = (name, mode, sharded, trial, step)
+                op = rng.random()
+                keys = [rng.choice([None] + list(range(12)))
+                        for _ in range(rng.randrange(1, 9))]
+                if op < 0.45:
+                    items = [(k, rng.choice([None, rng.randrange(100)]))
+                             for k in keys]
+                    ttl = rng.choice([None, 5]) if mode == "ttl" else None
+                    batch.put_many(items, ttl)
+                    for key, item in items:
+                        single.put(key, item, ttl)
+                elif op < 0.85:
+                    found = {}
+                    for key in keys:
+                        item = single.get(key)
+                        if item is not None:
+                            found[key] = item
+                    self.assertEqual(batch.get_many(keys), found, where)
+                else:
+                    deleted = sum(single.delete_many([k]) for k in keys)
+                    self.assertEqual(batch.delete_many(keys), deleted, where)
+                self.assertEqual(batch_events, single_events, where)
+                self.assertEqual(state(batch), state(single), where)
+
+    def test_policies(self):
+        """ Every policy, with and without TTLs, weights and sharding """
+        for module, name in POLICIES:
+            for mode in ("plain", "ttl", "weight"):
+                for sharded in (False, True):
+                    if sharded and name == "BasicCache":
+                        continue
+                    with self.subTest(policy=name, mode=mode,
+                                      sharded=sharded):
+                        self.check(module, name, mode, sharded)
+
+
+if __name__ == "__main__":
+    unittest.main()
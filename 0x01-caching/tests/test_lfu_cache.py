@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+""" Tests of the LFUCache module """
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from events import EVICTED  # noqa: E402
+
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+class ReferenceLFU:
+    """ Brute-force LFU: scans every key to find the one to evict """
+
+    def __init__(self, max_items, decay_interval=None):
+        """ Start empty """
+        self.max_items = max_items
+        self.decay_interval = decay_interval
+        self.entries = {}  # key: [item, frequency, last use]
+        self.clock = 0
+        self.accesses = 0
+        self.evicted = []
+
+    def _use(self, key, frequency):
+        """ Record a use of key with its new frequency """
+        self.clock += 1
+        self.entries[key][1:] = [frequency, self.clock]
+        self.accesses += 1
+        if self.decay_interval and self.accesses % self.decay_interval == 0:
+            for entry in self.entries.values():
+                entry[1] = max(1, entry[1] // 2)
+
+    def put(self, key, item):
+        """ Add or update an item, evicting the least used first """
+        if key in self.entries:
+            self.entries[key][0] = item
+            self._use(key, self.entries[key][1] + 1)
+            return
+        if len(self.entries) >= self.max_items:
+            victim = min(self.entries, key=lambda k: self.entries[k][1:])
+            del self.entries[victim]
+            self.evicted.append(victim)
+        self.entries[key] = [item, 0, 0]
+        self._use(key, 1)
+
+    def get(self, key):
+        """ Return the item of key, or None """
+        if key not in self.entries:
+            return None
+        self._use(key, self.entries[key][1] + 1)
+        return self.entries[key][0]
+
+
+class TestLFUCache(unittest.TestCase):
+    """ Tests of LFUCache """
+
+    def test_ties_are_least_recently_used(self):
+        """ Among the least used keys, the least recent one goes """
+        cache = LFUCache(3)
+        for key in "ABC":
+            cache.put(key, key)
+        cache.get("A")
+        cache.get("B")
+        cache.get("C")
+        cache.get("A")
+        cache.put("D", "D")
+        self.assertEqual(sorted(cache.cache_data), ["A", "C", "D"])
+
+    def test_decay_forgets_old_hits(self):
+        """ Keys hot long ago are evicted once frequencies age """
+        cache = LFUCache(2, decay_interval=4)
+        cache.put("A", 1)
+        for _ in range(5):
+            cache.get("A")
+        cache.put("B", 2)
+        for _ in range(4):
+            cache.get("B")
+        cache.put("C", 3)
+        self.assertEqual(sorted(cache.cache_data), ["B", "C"])
+
+    def test_matches_reference(self):
+        """ Random traces match the brute-force LFU """
+        for trial in range(500):
+            rng = random.Random(trial)
+            max_items = rng.randrange(1, 6)
+            decay_interval = rng.choice([None, 3, 7, 20])
+            cache = LFUCache(max_items, decay_interval=decay_interval)
+            reference = ReferenceLFU(max_items, decay_interval)
+            evicted = []
+            cache.add_listener(
+                lambda event, key, item: event == EVICTED and
+                evicted.append(key))
+            for step in range(100):
+                key = rng.randrange(8)
+                if rng.random() < 0.5:
+                    item = rng.randrange(100)
+                    cache.put(key, item)
+                    reference.put(key, item)
+                else:
+                    self.assertEqual(cache.get(key), reference.get(key),
+                                     (trial, step))
+            self.assertEqual(evicted, reference.evicted, trial)
+            self.assertEqual(cache.cache_data,
+                             {k: e[0] for k, e in reference.entries.items()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+""" Tests of the Memoize module """
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from memoize import cached  # noqa: E402
+from sharded_cache import ShardedCache  # noqa: E402
+
+
+class TestCached(unittest.TestCase):
+    """ Tests of the cached decorator """
+
+    def test_results_are_cached(self):
+        """ A second call with the same arguments is a hit """
+        calls = []
+
+        @cached(max_items=4)
+        def square(n):
+            calls.append(n)
+            return n * n
+
+        self.assertEqual([square(3), square(3), square(4)], [9, 9, 16])
+        self.assertEqual(calls, [3, 4])
+        self.assertEqual(square.cache.stats()["loads"], 2)
+
+    def test_sharded_cache_policy(self):
+        """ ShardedCache, whose first argument is a policy, works """
+        calls = []
+
+        @cached(policy=ShardedCache, max_items=8, segments=4)
+        def double(n):
+            calls.append(n)
+            return 2 * n
+
+        self.assertEqual([double(n) for n in (1, 2, 1, 2)], [2, 4, 2, 4])
+        self.assertEqual(calls, [1, 2])
+        self.assertIsInstance(double.cache, ShardedCache)
+        self.assertEqual(double.cache.stats()["loads"], 2)
+
+    def test_segments_are_not_serialized(self):
+        """ A hit is not held up by a put blocked in another segment """
+        putting = threading.Event()
+        release = threading.Event()
+
+        def weigher(item):
+            if item == "slow":
+                putting.set()
+                release.wait(5)
+            return 1
+
+        @cached(policy=ShardedCache, segments=2, max_weight=10,
+                weigher=weigher)
+        def value(n):
+            return "slow" if n == 0 else "fast"
+
+        # hash(n) % 2 puts 0 and 1 in different segments
+        self.assertEqual(value(1), "fast")
+        thread = threading.Thread(target=value, args=(0,))
+        thread.start()
+        self.assertTrue(putting.wait(5))
+        hit = []
+        reader = threading.Thread(target=lambda: hit.append(value(1)))
+        reader.start()
+        reader.join(1)
+        blocked = reader.is_alive()
+        release.set()
+        thread.join()
+        reader.join()
+        self.assertFalse(blocked)
+        self.assertEqual(hit, ["fast"])
+
+    def test_invalidate_during_load(self):
+        """ A result invalidated while it is computed is not cached """
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        @cached(max_items=4)
+        def load(n):
+            calls.append(n)
+            started.set()
+            release.wait(5)
+            return len(calls)
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(load(1)))
+        thread.start()
+        self.assertTrue(started.wait(5))
+        load.invalidate(1)
+        release.set()
+        thread.join()
+        self.assertEqual(results, [1])
+        self.assertEqual(load(1), 2)
+        self.assertEqual(load(1), 2)
+        self.assertEqual(calls, [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+""" Weight module """
+import sys
+from types import FunctionType, MethodType, ModuleType
+
+from events import EVICTED, REMOVED, EventsMixin
+
+
+def deep_sizeof(obj):
+    """
+    Return the size in bytes of an object and everything it holds.
+
+    Containers, instance dictionaries and slots are followed; objects
+    reachable twice are counted once. Classes, modules and functions
+    are shared rather than held, so they are neither counted nor
+    followed.
+
+    Args:
+        obj: The object to measure.
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        current = stack.pop()
+        if (id(current) in seen or
+                isinstance(current, (type, ModuleType, FunctionType,
+                                     MethodType))):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, (str, bytes, bytearray, int, float)):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for name in getattr(type(current), "__slots__", ()):
+            if hasattr(current, name):
+                stack.append(getattr(current, name))
+    return size
+
+
+class WeightMixin(EventsMixin):
+    """
+    Weight budget for the cache policies.
+
+    Every item is weighed once, when it is put; total_weight is kept up
+    to date on every insert and removal. After a put, the policy's
+    victims are evicted in order until the budget is met again. The new
+    key itself is never evicted, so an item heavier than the whole
+    budget is rejected up front instead of emptying the cache.
+
+    A policy using it calls _set_limits() when initialized, and in put
+    calls _weigh(key, item) first and _charge(key, weight) last. It
+    calls _forget(key) when it evicts a key, and implements _remove(key)
+    and _victims().
+    """
+
+    def _set_limits(self, max_items, max_weight=None, weigher=None):
+        """
+        Set the capacity of the cache.
+
+        Args:
+            max_items: Maximum number of items. Defaults to
+                BaseCaching.MAX_ITEMS, or no limit when max_weight is
+                given.
+            max_weight: Maximum total weight of the items, or None.
+            weigher: Function returning the weight of an item,
+                deep_sizeof by default.
+        """
+        if max_items is None:
+            max_items = self.MAX_ITEMS if max_weight is None else sys.maxsize
+        assert max_weight is None or max_weight > 0, \
+            "Max weight must be positive."
+        self.max_items = max_items
+        self.max_weight = max_weight
+        self.weigher = deep_sizeof if weigher is None else weigher
+        self.weights = {}  # Weight of every item, when weighed
+        self.total_weight = 0
+
+    def _forget(self, key):
+        """Drop the bookkeeping of a key that left the cache."""
+        weight = self.weights.pop(key, None)
+        if weight is not None:
+            self.total_weight -= weight
+
+    def _weigh(self, key, item):
+        """
+        Return the weight of an item about to be put.
+
+        Returns:
+            The weight (0 without a budget), or None if the item is
+            heavier than the whole budget. The key's previous item is
+            then removed, since it is outdated.
+        """
+        if self.max_weight is None:
+            return 0
+        weight = self.weigher(item)
+        if weight > self.max_weight:
+            if key in self.cache_data:
+                outdated = self.cache_data[key]
+                self._remove(key)
+                self._forget(key)
+                self._notify(REMOVED, key, outdated)
+            return None
+        return weight
+
+    def _charge(self, key, weight):
+        """Record the weight of an item just put, then shrink."""
+        if self.max_weight is None:
+            return
+        self.total_weight += weight - self.weights.get(key, 0)
+        self.weights[key] = weight
+        while self.total_weight > self.max_weight:
+            victim = next(k for k in self._victims() if k != key)
+            item = self.cache_data[victim]
+            self._remove(victim)
+            self._forget(victim)
+            self._notify(EVICTED, victim, item)
+
+    def _victims(self):
+        """Yield keys in the order the policy evicts them."""
+        raise NotImplementedError("_victims must be implemented")